@@ -8,6 +8,13 @@ __author__ = "Media Manager Bot"
 
 # Package initialization
 from .core.config import Config
-from .core.client import TgClient
 
 __all__ = ['Config', 'TgClient']
+
+
+def __getattr__(name):
+    # Resolve TgClient lazily so importing Config does not pull in Pyrogram
+    if name == 'TgClient':
+        from .core.client import TgClient
+        return TgClient
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
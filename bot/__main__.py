@@ -3,27 +3,60 @@ Clean entry point for Media Indexing Bot
 """
 
 import asyncio
-import logging  # <-- FIX: Added the missing import
+import atexit
+import logging
+import logging.handlers
+import queue
+from bot.core.config import Config
 from bot.core.startup import main
+from bot.modules import utils
 
 if __name__ == '__main__':
-    # Setup clean logging
+    Config.load()
+
+    # Setup clean logging. Records are pushed onto a queue by the event loop
+    # thread and written to disk/console by a background listener thread.
+    formatter = logging.Formatter(
+        fmt='[%(asctime)s] [%(levelname)s] - %(message)s',
+        datefmt='%d-%b-%y %I:%M:%S %p'
+    )
+    file_handler = logging.FileHandler("log.txt")
+    file_handler.setFormatter(formatter)
+    # Batch file writes; flush immediately only on ERROR and above
+    buffered_file_handler = logging.handlers.MemoryHandler(
+        capacity=512, flushLevel=logging.ERROR, target=file_handler, flushOnClose=True
+    )
+    atexit.register(buffered_file_handler.flush)
+    utils.LOG_FILE_HANDLER = buffered_file_handler
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
     logging.basicConfig(
-        format='[%(asctime)s] [%(levelname)s] - %(message)s',
-        datefmt='%d-%b-%y %I:%M:%S %p',
-        level=logging.INFO,
-        handlers=[
-            logging.FileHandler("log.txt"),
-            logging.StreamHandler()
-        ]
+        level=getattr(logging, Config.LOG_LEVEL, logging.WARNING),
+        handlers=[logging.handlers.QueueHandler(log_queue)]
+    )
+    listener = logging.handlers.QueueListener(
+        log_queue, buffered_file_handler, stream_handler, respect_handler_level=True
     )
-    
+    listener.start()
+
     # Reduce Pyrogram log noise
     logging.getLogger('pyrogram').setLevel(logging.WARNING)
-    
+
+    # Prefer the libuv-backed event loop when available
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
         print("\nBot stopped by user")
     except Exception as e:
         print(f"Fatal error: {e}")
+    finally:
+        listener.stop()
+        buffered_file_handler.flush()
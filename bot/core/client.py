@@ -2,9 +2,11 @@
 Pyrofork client management with peer ID error handling
 """
 
+import asyncio
 import logging
+import httpx
 from pyrogram import Client
-from pyrogram.errors import AuthKeyDuplicated, UserDeactivated
+from pyrogram.errors import AuthKeyDuplicated, UserDeactivated, Unauthorized
 from bot.core.config import Config
 import pyrogram.utils as pyroutils
 
@@ -19,17 +21,28 @@ class TgClient:
     
     bot = None
     user = None
+    bot_me = None
+    user_me = None
+    # Shared, pooled HTTP client for outbound API calls (e.g. TVMaze)
+    http = None
     
     @classmethod
     async def initialize(cls):
         """Initialize both bot and user clients"""
         try:
+            cls.http = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+                timeout=30
+            )
+
             cls.bot = Client(
                 name="MediaManagerBot",
                 api_id=Config.TELEGRAM_API,
                 api_hash=Config.TELEGRAM_HASH,
                 bot_token=Config.BOT_TOKEN,
-                workers=4
+                workers=Config.PYROGRAM_WORKERS,
+                # Don't replay updates missed while the bot was offline
+                skip_updates=True
             )
             
             cls.user = Client(
@@ -37,32 +50,48 @@ class TgClient:
                 api_id=Config.TELEGRAM_API,
                 api_hash=Config.TELEGRAM_HASH,
                 session_string=Config.USER_SESSION_STRING,
-                workers=4
+                workers=Config.PYROGRAM_WORKERS
             )
             
-            await cls.bot.start()
-            bot_info = await cls.bot.get_me()
-            LOGGER.info(f"Bot client started as @{bot_info.username}")
-
-            await cls.user.start()
-            user_info = await cls.user.get_me()
-            LOGGER.info(f"User client started as @{user_info.username}")
+            await asyncio.gather(cls.bot.start(), cls.user.start())
+            # Pyrofork already fetched get_me() during start(); reuse it
+            cls.bot_me, cls.user_me = cls.bot.me, cls.user.me
+            LOGGER.info("Bot client started as @%s", cls.bot_me.username)
+            LOGGER.info("User client started as @%s", cls.user_me.username)
+            await cls._warm_peer_cache()
             
         except (AuthKeyDuplicated, UserDeactivated, Unauthorized) as e:
-            LOGGER.error(f"Telegram authentication error: {e}. Please regenerate your user session string and restart the bot.")
+            LOGGER.error("Telegram authentication error: %s. Please regenerate your user session string and restart the bot.", e)
             raise
         except Exception as e:
-            LOGGER.error(f"Failed to initialize clients: {e}")
+            LOGGER.error("Failed to initialize clients: %s", e)
             raise
     
+    @classmethod
+    async def _warm_peer_cache(cls):
+        """Resolve configured chats once so later lookups hit Pyrogram's peer storage"""
+        chat_ids = set(Config.AUTHORIZED_IDS)
+        if Config.INDEX_CHANNEL_ID:
+            chat_ids.add(Config.INDEX_CHANNEL_ID)
+        if not chat_ids:
+            return
+        results = await asyncio.gather(*(cls.user.get_chat(cid) for cid in chat_ids), return_exceptions=True)
+        for chat_id, result in zip(chat_ids, results):
+            if isinstance(result, Exception):
+                LOGGER.warning("Could not pre-resolve chat %s: %s", chat_id, result)
+        LOGGER.info("Pre-resolved %d configured chats", len(chat_ids))
+
     @classmethod
     async def stop(cls):
         """Stop both clients gracefully"""
         try:
-            if cls.bot and cls.bot.is_connected:
-                await cls.bot.stop()
-            if cls.user and cls.user.is_connected:
-                await cls.user.stop()
+            clients = [c for c in (cls.bot, cls.user) if c and c.is_connected]
+            results = await asyncio.gather(*(c.stop() for c in clients), return_exceptions=True)
+            for result in results:
+                if isinstance(result, Exception):
+                    LOGGER.error("Error stopping client: %s", result)
+            if cls.http is not None:
+                await cls.http.aclose()
             LOGGER.info("All clients stopped gracefully.")
         except Exception as e:
-            LOGGER.error(f"Error stopping clients: {e}")
+            LOGGER.error("Error stopping clients: %s", e)
@@ -3,8 +3,19 @@ Clean configuration management for Media Indexing Bot
 """
 
 import os
+from pathlib import Path
 from dotenv import load_dotenv
 
+# Resolved location of config.env, looked up once per process
+_RESOLVED_CONFIG_PATH = None
+
+def _config_path():
+    """Resolve config.env once and reuse the result on later loads"""
+    global _RESOLVED_CONFIG_PATH
+    if _RESOLVED_CONFIG_PATH is None:
+        _RESOLVED_CONFIG_PATH = Path('config.env').resolve()
+    return _RESOLVED_CONFIG_PATH
+
 class Config:
     """Essential configuration for media indexing operations"""
     
@@ -18,23 +29,32 @@ class Config:
     # Optional settings
     DATABASE_URL = None
     AUTHORIZED_CHATS = None
+    AUTHORIZED_IDS = frozenset()  # Parsed from AUTHORIZED_CHATS
     INDEX_CHANNEL_ID = None
     
     # Bot settings
     TIMEZONE = None
     MEDIAINFO_ENABLED = None
     MAX_CONCURRENT_TASKS = None
+    MAX_CONCURRENT_COMMANDS = None
     DOWNLOAD_DIR = None
     CMD_SUFFIX = None
     AUTHOR_NAME = None
     AUTHOR_URL = None
     USE_TVMAZE_TITLES = None # New setting
+    LOG_LEVEL = None
+    PYROGRAM_WORKERS = None
+
+    _loaded = False
     
     @classmethod
     def load(cls):
-        """Load environment variables from config.env"""
-        load_dotenv('config.env')
+        """Load environment variables from config.env (parsed only once)"""
+        if cls._loaded:
+            return
+        load_dotenv(_config_path())
         cls._set_attributes()
+        cls._loaded = True
         
     @classmethod
     def _set_attributes(cls):
@@ -46,21 +66,33 @@ class Config:
         cls.OWNER_ID = int(os.getenv('OWNER_ID', '0'))
         cls.DATABASE_URL = os.getenv('DATABASE_URL', '')
         cls.AUTHORIZED_CHATS = os.getenv('AUTHORIZED_CHATS', '')
+        cls.AUTHORIZED_IDS = cls._parse_ids(cls.AUTHORIZED_CHATS)
         cls.INDEX_CHANNEL_ID = int(os.getenv('INDEX_CHANNEL_ID', '0'))
         cls.TIMEZONE = os.getenv('TIMEZONE', 'Asia/Kolkata')
         cls.MEDIAINFO_ENABLED = os.getenv('MEDIAINFO_ENABLED', 'True').lower() == 'true'
         cls.MAX_CONCURRENT_TASKS = int(os.getenv('MAX_CONCURRENT_TASKS', '5'))
+        cls.MAX_CONCURRENT_COMMANDS = int(os.getenv('MAX_CONCURRENT_COMMANDS', '10'))
         cls.DOWNLOAD_DIR = os.getenv('DOWNLOAD_DIR', '/tmp/mediainfo/')
         cls.CMD_SUFFIX = os.getenv('CMD_SUFFIX', '')
         cls.AUTHOR_NAME = os.getenv('AUTHOR_NAME', 'Media Manager Bot')
         cls.AUTHOR_URL = os.getenv('AUTHOR_URL', 'https://t.me/MediaManagerBot')
         # Add the new setting
         cls.USE_TVMAZE_TITLES = os.getenv('USE_TVMAZE_TITLES', 'True').lower() == 'true'
+        cls.LOG_LEVEL = os.getenv('LOG_LEVEL', 'WARNING').upper()
+        cls.PYROGRAM_WORKERS = int(os.getenv('PYROGRAM_WORKERS', str(min(32, (os.cpu_count() or 4) * 4))))
+
+    @staticmethod
+    def _parse_ids(value):
+        """Parses a comma separated list of chat IDs into a frozenset of ints"""
+        return frozenset(int(x.strip()) for x in (value or '').split(',') if x.strip())
 
     @classmethod
     def set(cls, key, value):
         """Dynamically sets a configuration attribute."""
         if hasattr(cls, key):
+            if key == 'AUTHORIZED_CHATS':
+                # Parse first so an invalid list raises before anything changes
+                cls.AUTHORIZED_IDS = cls._parse_ids(value)
             setattr(cls, key, value)
             return True
         return False
@@ -5,9 +5,11 @@ Pyrofork command handlers registration
 import logging
 import asyncio
 from pyrogram import filters
+from pyrogram.errors import RPCError
 from pyrogram.handlers import MessageHandler, CallbackQueryHandler
 
 from bot.core.client import TgClient
+from bot.core.config import Config
 from bot.helpers.auth_filters import AuthFilters
 from bot.modules.updatemediainfo import updatemediainfo_handler
 from bot.modules.indexfiles import indexfiles_handler
@@ -21,9 +23,17 @@ from bot.modules.findencoders import findencoders_handler
 
 LOGGER = logging.getLogger(__name__)
 
-async def start_handler(client, message):
-    """Welcome message handler"""
-    welcome_text = """***Media Manager Bot***
+_CANCEL_PREFIX = "cancel_"
+_SET_PREFIX = "set_"
+
+async def _callback_prefix(flt, _, callback_query):
+    return (callback_query.data or "").startswith(flt.prefix)
+
+def _prefix_filter(prefix):
+    """Matches callback queries whose data starts with a fixed prefix (or tuple of prefixes)."""
+    return filters.create(_callback_prefix, prefix=prefix)
+
+WELCOME_TEXT = """***Media Manager Bot***
 
 **Purpose:** Extract MediaInfo and organize channel content
 
@@ -38,8 +48,10 @@ async def start_handler(client, message):
 • `/findencoders` - Find potential encoders in a channel
 
 **Ready to index your media content!**"""
-    
-    await message.reply_text(welcome_text)
+
+async def start_handler(client, message):
+    """Welcome message handler"""
+    await message.reply_text(WELCOME_TEXT)
 
 async def cancel_task_callback(client, callback_query):
     """Handles the 'Cancel' button press for a running task."""
@@ -51,50 +63,84 @@ async def cancel_task_callback(client, callback_query):
         task_to_cancel.cancel()
         try:
             await callback_query.answer("Sent cancellation request for the task.", show_alert=True)
-        except:
+        except RPCError:
             pass
     else:
         try:
             await callback_query.answer("This task is no longer running or may have already completed.", show_alert=True)
-        except:
+        except RPCError:
             pass
 
+# Command name -> handler, built once at import
+COMMAND_HANDLERS = {
+    "start": start_handler,
+    "updatemediainfo": updatemediainfo_handler,
+    "indexfiles": indexfiles_handler,
+    "status": status_handler,
+    "settings": settings_handler,
+    "help": help_handler,
+    "log": log_handler,
+    "stats": stats_handler,
+    "findencoders": findencoders_handler,
+}
+
+# Callback data prefix -> handler
+CALLBACK_HANDLERS = {
+    _CANCEL_PREFIX: cancel_task_callback,
+    # This one generic handler will now catch all "set" buttons
+    _SET_PREFIX: set_setting_callback,
+}
+
+# Commands that scan a whole channel inline; they must not hold a command slot
+_UNGATED_COMMANDS = frozenset({"findencoders"})
+
+# --- FIX: More generic filter to check for any awaiting state ---
+async def awaiting_input_filter(_, __, message):
+    # Nobody is mid-conversation in the common case
+    if not USER_STATES or not message.from_user:
+        return False
+    return USER_STATES.get((message.from_user.id, message.chat.id)) is not None
+
+# Composite filters, built once at import
+_COMMAND_FILTER = filters.command(list(COMMAND_HANDLERS)) & AuthFilters.authorized
+# Only text replies are consumed as setting values; stickers, photos etc. pass through
+_AWAITING_INPUT_FILTER = filters.text & filters.create(awaiting_input_filter) & AuthFilters.authorized
+_CALLBACK_FILTER = _prefix_filter(tuple(CALLBACK_HANDLERS))
+
+def _command_dispatcher(semaphore):
+    """Routes a matched command to its handler in COMMAND_HANDLERS, at most N at a time."""
+    async def dispatch(client, message):
+        command = message.command[0]
+        handler = COMMAND_HANDLERS[command]
+        if command in _UNGATED_COMMANDS:
+            return await handler(client, message)
+        async with semaphore:
+            return await handler(client, message)
+    return dispatch
+
+async def _dispatch_callback(client, callback_query):
+    """Routes a callback query to its handler by the data prefix up to the first underscore."""
+    data = callback_query.data
+    await CALLBACK_HANDLERS[data[:data.index("_") + 1]](client, callback_query)
+
 def register_handlers():
     """Register all command and callback handlers with Pyrofork"""
     bot = TgClient.bot
+    semaphore = asyncio.Semaphore(Config.MAX_CONCURRENT_COMMANDS)
     
-    # --- FIX: More generic filter to check for any awaiting state ---
-    async def awaiting_input_filter(_, __, message):
-        if message.from_user:
-            return USER_STATES.get(message.from_user.id, "").startswith("awaiting_")
-        return False
-
-    # Command Handlers
+    # Command Handlers: one handler for every command, so authorization is checked once per message
     command_handlers = [
-        MessageHandler(start_handler, filters.command("start") & AuthFilters.authorized),
-        MessageHandler(updatemediainfo_handler, filters.command("updatemediainfo") & AuthFilters.authorized),
-        MessageHandler(indexfiles_handler, filters.command("indexfiles") & AuthFilters.authorized),
-        MessageHandler(status_handler, filters.command("status") & AuthFilters.authorized),
-        MessageHandler(settings_handler, filters.command("settings") & AuthFilters.authorized),
-        MessageHandler(help_handler, filters.command("help") & AuthFilters.authorized),
-        MessageHandler(log_handler, filters.command("log") & AuthFilters.authorized),
-        MessageHandler(stats_handler, filters.command("stats") & AuthFilters.authorized),
-        MessageHandler(findencoders_handler, filters.command("findencoders") & AuthFilters.authorized),
+        MessageHandler(_command_dispatcher(semaphore), _COMMAND_FILTER),
         # This one generic handler will now catch replies for all settings
-        MessageHandler(receive_setting_handler, filters.create(awaiting_input_filter) & AuthFilters.authorized & filters.private)
+        MessageHandler(receive_setting_handler, _AWAITING_INPUT_FILTER),
     ]
     
-    for handler in command_handlers:
-        bot.add_handler(handler)
-    
-    # Callback Query Handlers
+    # Callback Query Handlers: a single prefix check routes every button press
     callback_handlers = [
-        CallbackQueryHandler(cancel_task_callback, filters.regex("^cancel_")),
-        # This one generic handler will now catch all "set" buttons
-        CallbackQueryHandler(set_setting_callback, filters.regex("^set_")),
+        CallbackQueryHandler(_dispatch_callback, _CALLBACK_FILTER),
     ]
 
-    for handler in callback_handlers:
+    for handler in command_handlers + callback_handlers:
         bot.add_handler(handler)
 
-    LOGGER.info("All command and callback handlers registered successfully")
+    LOGGER.info("Registered %d command handlers: %s", len(COMMAND_HANDLERS), ", ".join(COMMAND_HANDLERS))
@@ -3,9 +3,12 @@ Clean bot startup sequence
 """
 
 import asyncio
+import hashlib
 import logging
 import os
+import signal
 import time
+from dataclasses import dataclass
 from pyrogram.errors import MessageNotModified, MessageDeleteForbidden
 from pyrogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 from bot.core.config import Config
@@ -16,27 +19,49 @@ from bot.helpers.message_utils import edit_message
 
 LOGGER = logging.getLogger(__name__)
 
+STATUS_POLL_INTERVAL = 10
+STATUS_MAX_IDLE_INTERVAL = 60
+
+
+@dataclass(slots=True)
+class _StatusChat:
+    id: int
+
+
+@dataclass(slots=True)
+class _StatusMessage:
+    """Minimal stand-in for a Message so edit_message can target the tracked status post."""
+    chat: _StatusChat
+    id: int
+
+
+# Every possible 10-step progress bar, indexed by completed tenths
+PROGRESS_BARS = tuple('█' * i + '░' * (10 - i) for i in range(11))
+
 async def update_status_periodically():
     """A background task that periodically updates the central status message."""
     was_active = False
+    idle_count = 0
+    last_digest = None
     while True:
-        # --- FIX: Changed sleep interval from 5 to 10 seconds ---
-        await asyncio.sleep(10)
+        # Poll every 10 seconds while busy, backing off towards a minute when idle
+        await asyncio.sleep(min(STATUS_MAX_IDLE_INTERVAL, STATUS_POLL_INTERVAL * 2 ** idle_count))
         if MongoDB.db is None:
             continue
 
-        status_message_doc = await MongoDB.get_status_message()
+        status_message_doc, active_scans = await MongoDB.get_status_and_scans()
         if not status_message_doc:
             was_active = False
+            last_digest = None
+            idle_count = min(idle_count + 1, 3)
             continue
 
         chat_id = status_message_doc.get('chat_id')
         message_id = status_message_doc.get('message_id')
         
         try:
-            active_scans = await MongoDB.get_active_scans()
-            
             is_active_now = bool(active_scans)
+            idle_count = 0 if is_active_now else min(idle_count + 1, 3)
             if was_active and not is_active_now:
                 try:
                     await TgClient.bot.delete_messages(chat_id, message_id)
@@ -44,15 +69,15 @@ async def update_status_periodically():
                 except (MessageDeleteForbidden, AttributeError):
                     pass 
                 except Exception as e:
-                    LOGGER.warning(f"Could not delete final status message: {e}")
+                    LOGGER.warning("Could not delete final status message: %s", e)
                 was_active = False
                 continue
             was_active = is_active_now
 
-            text = "**Live Task Status**\n\n"
+            parts = ["**Live Task Status**\n\n"]
             buttons = []
             if not active_scans:
-                text += "Bot is currently idle. No active tasks."
+                parts.append("Bot is currently idle. No active tasks.")
             else:
                 for i, scan in enumerate(active_scans, 1):
                     operation = scan.get('operation', 'Processing').title()
@@ -60,53 +85,54 @@ async def update_status_periodically():
                     current = scan.get('processed_messages', 0)
                     total = scan.get('total_messages', 0)
                     progress = (current / total * 100) if total > 0 else 0
-                    bar = f"[{'█' * int(progress / 10)}{'░' * (10 - int(progress / 10))}] {progress:.1f}%"
+                    bar = f"[{PROGRESS_BARS[min(10, int(progress / 10))]}] {progress:.1f}%"
                     
-                    text += f"**{i}. {operation}:** `{channel}`\n"
+                    parts.append(f"**{i}. {operation}:** `{channel}`\n")
                     
                     # --- FIX: Check for and display flood wait status ---
                     flood_wait_until = scan.get('flood_wait_until')
                     if flood_wait_until and flood_wait_until > time.time():
                         remaining_time = int(flood_wait_until - time.time())
-                        text += f"   `STATUS: Paused (FloodWait for {remaining_time}s)`\n"
+                        parts.append(f"   `STATUS: Paused (FloodWait for {remaining_time}s)`\n\n")
                     else:
-                        text += f"   `{bar}`\n"
-                        text += f"   `Processed: {current} / {total}`\n"
-
-                    text += "\n"
+                        parts.append(f"   `{bar}`\n   `Processed: {current} / {total}`\n\n")
                     buttons.append([InlineKeyboardButton(f"Cancel Task #{i}", callback_data=f"cancel_{scan['_id']}")])
 
-            class DummyMessage:
-                def __init__(self, cid, mid):
-                    self.chat = type('Chat', (), {'id': cid})()
-                    self.id = mid
+            text = "".join(parts)
+
+            # Skip the edit entirely when the rendered status hasn't changed
+            digest = hashlib.blake2b(f"{chat_id}:{message_id}:{text}".encode(), digest_size=8).digest()
+            if digest == last_digest:
+                continue
 
             keyboard = InlineKeyboardMarkup(buttons) if buttons else None
-            await edit_message(DummyMessage(chat_id, message_id), text, keyboard)
+            # edit_message logs and swallows failures; only remember text that actually went out
+            if await edit_message(_StatusMessage(_StatusChat(chat_id), message_id), text, keyboard) is not None:
+                last_digest = digest
 
         except MessageNotModified:
             pass
         except Exception as e:
-            LOGGER.error(f"Could not update status message: {e}")
+            LOGGER.error("Could not update status message: %s", e)
 
 async def check_and_notify_interrupted_scans():
     if not Config.DATABASE_URL or MongoDB.db is None:
         return
     
-    interrupted = await MongoDB.get_active_scans()
-    if interrupted:
-        notification_text = "**Bot Restarted with Interrupted Scans**\n\nThe following scans were interrupted and did not complete:\n"
-        for scan in interrupted:
-            progress = f"{scan.get('processed_messages', 0)} / {scan.get('total_messages', 'N/A')}"
-            notification_text += (
-                f"\n- **Channel:** {scan.get('chat_title', 'Unknown')}\n"
-                f"  **Progress:** {progress} messages\n"
-            )
+    lines = []
+    async for scan in MongoDB.iter_active_scans({'chat_title': 1, 'processed_messages': 1, 'total_messages': 1}):
+        progress = f"{scan.get('processed_messages', 0)} / {scan.get('total_messages', 'N/A')}"
+        lines.append(
+            f"\n- **Channel:** {scan.get('chat_title', 'Unknown')}\n"
+            f"  **Progress:** {progress} messages\n"
+        )
+    if lines:
+        notification_text = "**Bot Restarted with Interrupted Scans**\n\nThe following scans were interrupted and did not complete:\n" + "".join(lines)
         
         try:
             await TgClient.bot.send_message(Config.OWNER_ID, notification_text)
         except Exception as e:
-            LOGGER.warning(f"Failed to send interruption notification: {e}")
+            LOGGER.warning("Failed to send interruption notification: %s", e)
         
         await MongoDB.clear_all_scans()
 
@@ -122,7 +148,7 @@ async def main():
             try:
                 await MongoDB.initialize()
             except Exception as e:
-                LOGGER.warning(f"DB connection failed: {e}")
+                LOGGER.warning("DB connection failed: %s", e)
         
         await TgClient.initialize()
         
@@ -135,12 +161,22 @@ async def main():
         
         LOGGER.info("Media Manager Bot started successfully!")
         
-        await asyncio.Future()
+        # Block until SIGINT/SIGTERM so the cleanup below runs promptly
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stop.set)
+            except NotImplementedError:
+                # Not supported on Windows; KeyboardInterrupt still applies there
+                pass
+        await stop.wait()
+        LOGGER.info("Shutdown signal received, stopping bot.")
         
     except KeyboardInterrupt:
         LOGGER.info("Bot stopped by user.")
     except Exception as e:
-        LOGGER.error(f"Startup failed: {e}")
+        LOGGER.error("Startup failed: %s", e)
         raise
     finally:
         await TgClient.stop()
@@ -6,6 +6,25 @@ Global task and state management for the bot.
 # Key: scan_id (str), Value: asyncio.Task object
 ACTIVE_TASKS = {}
 
-# A dictionary to hold the state of user conversations (e.g., for /settings)
-# Key: user_id (int), Value: state (str)
-USER_STATES = {}
+class _FSMStore:
+    """In-memory conversation state, keyed on (user_id, chat_id)."""
+    __slots__ = ("_d",)
+
+    def __init__(self):
+        self._d = {}
+
+    def __len__(self):
+        return len(self._d)
+
+    def get(self, key):
+        return self._d.get(key)
+
+    def set(self, key, state):
+        self._d[key] = state
+
+    def pop(self, key):
+        return self._d.pop(key, None)
+
+# The state of user conversations (e.g., for /settings)
+# Key: (user_id, chat_id), Value: state (str)
+USER_STATES = _FSMStore()
@@ -1,13 +1,38 @@
 """
 MongoDB database interface for advanced indexing and task management.
 """
+import asyncio
 import logging
+from collections import OrderedDict
+from datetime import datetime, timezone
+from functools import lru_cache
 from motor.motor_asyncio import AsyncIOMotorClient
 from bot.core.config import Config
-import pymongo
+from pymongo import IndexModel, ReadPreference, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, OperationFailure, PyMongoError
 
 LOGGER = logging.getLogger(__name__)
 
+# How often buffered scan progress, message ID cache and media writes are flushed
+WRITE_FLUSH_INTERVAL = 0.5
+# Flush buffered media entries early once this many are pending
+MEDIA_FLUSH_THRESHOLD = 500
+# Post tracker document types stored in the task collection
+POST_TYPES = ['series_season', 'movie']
+# Bounded in-process front for tvmaze_cache, and how long Mongo keeps an entry
+TVMAZE_LRU_MAX = 4096
+TVMAZE_CACHE_TTL = 7 * 24 * 60 * 60
+# Change events that can affect the set of active scans
+ACTIVE_SCAN_PIPELINE = [{'$match': {'$or': [
+    {'operationType': 'delete'},
+    {'fullDocument.type': 'active_scan'}
+]}}]
+
+@lru_cache(maxsize=8192)
+def _slug(title):
+    """Normalizes a title for use in post tracker IDs."""
+    return title.lower().replace(' ', '_')
+
 class MongoDB:
     client = None
     db = None
@@ -15,79 +40,335 @@ class MongoDB:
     media_collection = None
     message_ids_cache = None
     tvmaze_cache = None
-    sync_client = None
-    sync_db = None
+    _tvmaze_lru = OrderedDict()
+    # Pending TVMaze cache writes per lowercased title, written back by the flusher
+    _tvmaze_buffer = {}
+    # Coalesced writes: latest progress per scan_id, pending message IDs per channel_id
+    _progress_buffer = {}
+    _message_ids_buffer = {}
+    # Pending media updates per canonical_title: merged $set / $inc / $addToSet fields
+    _media_buffer = {}
+    _media_pending = 0
+    # Held across the swap and bulk_write so readers can wait for an in-flight media flush
+    _media_lock = asyncio.Lock()
+    _flush_task = None
+    # Set by close() so the flusher exits between flushes instead of being cancelled mid-write
+    _flush_stop = None
+    # Active scans mirrored from a change stream; None when change streams are unavailable
+    _active_scans_cache = None
+    _watch_task = None
 
     @classmethod
     async def initialize(cls):
+        # A second call would open another pool and restart the background tasks
+        if cls.client is not None: return
         try:
-            cls.client = AsyncIOMotorClient(Config.DATABASE_URL)
+            cls.client = AsyncIOMotorClient(
+                Config.DATABASE_URL,
+                maxPoolSize=50,
+                minPoolSize=10,
+                # Let sockets opened for a scan burst drain back down to minPoolSize
+                maxIdleTimeMS=60000,
+                # zlib ships with Python; zstd/snappy would need extra packages
+                compressors='zlib',
+                retryWrites=True
+            )
             cls.db = cls.client.mediaindexbot
             cls.task_collection = cls.db.mediamanager
             cls.media_collection = cls.db.media_data
             cls.message_ids_cache = cls.db.message_ids_cache
-            cls.sync_client = pymongo.MongoClient(Config.DATABASE_URL)
-            cls.sync_db = cls.sync_client.mediaindexbot
-            cls.tvmaze_cache = cls.sync_db.tvmaze_cache
-            await cls.client.admin.command('ismaster')
+            # TVMaze payloads tolerate slightly stale reads, so let secondaries serve them
+            cls.tvmaze_cache = cls.db.tvmaze_cache.with_options(read_preference=ReadPreference.SECONDARY_PREFERRED)
+            # Connectivity check and index setup are independent; overlap their round-trips
+            await asyncio.gather(
+                cls.client.admin.command('ismaster'),
+                # Serves the 'type' lookups (active scans, posts per channel) without a collection scan;
+                # the trailing canonical_title lets the per-channel title distinct run as a covered query
+                cls.task_collection.create_indexes([
+                    IndexModel([('type', 1), ('channel_id', 1), ('canonical_title', 1)])
+                ]),
+                cls.tvmaze_cache.create_index([('inserted_at', 1)], expireAfterSeconds=TVMAZE_CACHE_TTL)
+            )
+            cls._flush_stop = asyncio.Event()
+            cls._flush_task = asyncio.create_task(cls._write_flusher())
+            cls._watch_task = asyncio.create_task(cls._watch_active_scans())
             LOGGER.info("MongoDB connected successfully.")
         except Exception as e:
-            LOGGER.error(f"MongoDB connection failed: {e}")
+            LOGGER.error("MongoDB connection failed: %s", e)
             raise
 
     @classmethod
     async def close(cls):
+        if cls._watch_task is not None:
+            cls._watch_task.cancel()
+            cls._watch_task = None
+            cls._active_scans_cache = None
+        if cls._flush_task is not None:
+            # Let a flush already in progress finish; cancelling it would drop its swapped-out snapshot
+            cls._flush_stop.set()
+            await cls._flush_task
+            cls._flush_task = None
+            try:
+                await cls._flush_writes()
+            except Exception as e:
+                LOGGER.error("Failed to flush buffered writes on close: %s", e)
         if cls.client is not None:
             cls.client.close()
-        if cls.sync_client is not None:
-            cls.sync_client.close()
+            cls.client = None
         LOGGER.info("MongoDB connections closed.")
 
     @classmethod
-    def get_tvmaze_cache(cls, title):
+    async def _watch_active_scans(cls):
+        """Keeps _active_scans_cache in sync with the task collection via a change stream."""
+        while True:
+            try:
+                async with cls.task_collection.watch(ACTIVE_SCAN_PIPELINE, full_document='updateLookup') as stream:
+                    # Seed after the stream is open so no change is missed in between
+                    scans = await cls.task_collection.find({'type': 'active_scan'}).to_list(length=None)
+                    cls._active_scans_cache = {doc['_id']: doc for doc in scans}
+                    async for change in stream:
+                        doc = change.get('fullDocument')
+                        if change['operationType'] == 'delete' or doc is None:
+                            cls._active_scans_cache.pop(change['documentKey']['_id'], None)
+                        else:
+                            cls._active_scans_cache[doc['_id']] = doc
+            except OperationFailure as e:
+                # Standalone servers don't support change streams; keep polling instead
+                cls._active_scans_cache = None
+                LOGGER.info("Change streams unavailable, active scans will be polled: %s", e)
+                return
+            except PyMongoError as e:
+                cls._active_scans_cache = None
+                LOGGER.warning("Active scan change stream interrupted, retrying: %s", e)
+                await asyncio.sleep(5)
+
+    @classmethod
+    async def _write_flusher(cls):
+        """Background task that periodically flushes coalesced writes."""
+        while True:
+            try:
+                await asyncio.wait_for(cls._flush_stop.wait(), WRITE_FLUSH_INTERVAL)
+                return
+            except asyncio.TimeoutError:
+                pass
+            await cls._flush_writes()
+
+    @classmethod
+    async def _flush_writes(cls):
+        """Flushes every write buffer; a failing buffer is kept for retry and does not block the others."""
+        for flush in (cls._flush_progress, cls._flush_message_ids, cls._flush_tvmaze, cls.flush_media_entries):
+            try:
+                await flush()
+            except Exception as e:
+                LOGGER.error("Failed to flush buffered writes in %s, will retry: %s", flush.__name__, e)
+
+    @classmethod
+    async def _flush_progress(cls):
+        if not cls._progress_buffer or cls.task_collection is None:
+            return
+        progress, cls._progress_buffer = cls._progress_buffer, {}
+        try:
+            await cls.task_collection.bulk_write(
+                [UpdateOne({'_id': scan_id, 'type': 'active_scan'}, {'$set': {'processed_messages': count}})
+                 for scan_id, count in progress.items()],
+                ordered=False
+            )
+        except Exception:
+            # Newer progress buffered meanwhile wins over the failed snapshot
+            for scan_id, count in progress.items():
+                cls._progress_buffer.setdefault(scan_id, count)
+            raise
+
+    @classmethod
+    async def _flush_message_ids(cls):
+        if not cls._message_ids_buffer or cls.message_ids_cache is None:
+            return
+        pending, cls._message_ids_buffer = cls._message_ids_buffer, {}
+        try:
+            await cls.message_ids_cache.bulk_write(
+                [UpdateOne(
+                    {'_id': channel_id},
+                    # Pipeline update: a server-side set union instead of $addToSet's per-element array scan
+                    [{'$set': {'message_ids': {'$setUnion': [{'$ifNull': ['$message_ids', []]}, ids]}}}],
+                    upsert=True
+                ) for channel_id, ids in pending.items()],
+                ordered=False
+            )
+        except Exception:
+            # The union is idempotent, so the whole snapshot can simply be retried
+            for channel_id, ids in pending.items():
+                cls._message_ids_buffer[channel_id] = ids + cls._message_ids_buffer.get(channel_id, [])
+            raise
+
+    @classmethod
+    async def _flush_tvmaze(cls):
+        if not cls._tvmaze_buffer or cls.tvmaze_cache is None:
+            return
+        pending, cls._tvmaze_buffer = cls._tvmaze_buffer, {}
+        now = datetime.now(timezone.utc)
+        try:
+            await cls.tvmaze_cache.bulk_write(
+                [UpdateOne({'_id': key}, {'$set': {'data': data, 'inserted_at': now}}, upsert=True)
+                 for key, data in pending.items()],
+                ordered=False
+            )
+        except Exception:
+            for key, data in pending.items():
+                cls._tvmaze_buffer.setdefault(key, data)
+            raise
+
+    @classmethod
+    async def flush_media_entries(cls):
+        """Writes all buffered media entries, one upsert per title. Failed entries are kept for retry."""
+        if cls.media_collection is None:
+            return
+        async with cls._media_lock:
+            if not cls._media_buffer:
+                return
+            pending, cls._media_buffer, cls._media_pending = cls._media_buffer, {}, 0
+            titles, operations = [], []
+            for canonical_title, fields in pending.items():
+                update = {'$set': fields['set']}
+                if fields['inc']:
+                    update['$inc'] = fields['inc']
+                if fields['addToSet']:
+                    update['$addToSet'] = {key: {'$each': values} for key, values in fields['addToSet'].items()}
+                titles.append(canonical_title)
+                operations.append(UpdateOne({'_id': canonical_title}, update, upsert=True))
+            try:
+                await cls.media_collection.bulk_write(operations, ordered=False)
+            except BulkWriteError as e:
+                # Only requeue the upserts that failed; the rest were applied and their $inc must not repeat
+                for error in e.details.get('writeErrors', []):
+                    title = titles[error['index']]
+                    cls._requeue_media(title, pending[title])
+                raise
+            except Exception:
+                for title in titles:
+                    cls._requeue_media(title, pending[title])
+                raise
+
+    @classmethod
+    def _requeue_media(cls, canonical_title, fields):
+        """Merges a failed title update back under any entries buffered since the swap."""
+        current = cls._media_buffer.get(canonical_title)
+        if current is None:
+            cls._media_buffer[canonical_title] = fields
+        else:
+            current['set'] = {**fields['set'], **current['set']}
+            for key, amount in fields['inc'].items():
+                current['inc'][key] = current['inc'].get(key, 0) + amount
+            for key, values in fields['addToSet'].items():
+                merged = current['addToSet'].setdefault(key, [])
+                merged[:0] = [value for value in values if value not in merged]
+        cls._media_pending += 1
+
+    @classmethod
+    async def get_tvmaze_cache(cls, title):
+        key = title.lower()
+        cached = cls._tvmaze_lru.get(key)
+        if cached is not None:
+            cls._tvmaze_lru.move_to_end(key)
+            return cached
         if cls.tvmaze_cache is not None:
-            return cls.tvmaze_cache.find_one({'_id': title.lower()})
+            cached = await cls.tvmaze_cache.find_one({'_id': key}, projection={'data': 1, '_id': 0})
+            if cached is not None:
+                cls._remember_tvmaze(key, cached)
+            return cached
         return None
 
     @classmethod
-    def set_tvmaze_cache(cls, title, data):
+    def _remember_tvmaze(cls, key, document):
+        cls._tvmaze_lru[key] = document
+        cls._tvmaze_lru.move_to_end(key)
+        if len(cls._tvmaze_lru) > TVMAZE_LRU_MAX:
+            cls._tvmaze_lru.popitem(last=False)
+
+    @classmethod
+    async def set_tvmaze_cache(cls, title, data):
+        """Caches the payload in memory and queues it for write-back by the flusher."""
+        key = title.lower()
+        cls._remember_tvmaze(key, {'data': data})
         if cls.tvmaze_cache is not None:
-            cls.tvmaze_cache.update_one(
-                {'_id': title.lower()},
-                {'$set': {'data': data}},
-                upsert=True
-            )
+            cls._tvmaze_buffer[key] = data
 
     @classmethod
-    async def get_cached_message_ids(cls, channel_id):
+    async def get_cached_message_ids(cls, channel_id, above=0):
+        """Returns cached message IDs for the channel, optionally only those newer than `above`."""
         if cls.message_ids_cache is None: return []
-        document = await cls.message_ids_cache.find_one({'_id': channel_id})
-        return document.get('message_ids', []) if document else []
+        pending = cls._message_ids_buffer.get(channel_id, [])
+        if above:
+            # Filter server-side so IDs below the high-water mark never cross the wire
+            pipeline = [
+                {'$match': {'_id': channel_id}},
+                {'$project': {'_id': 0, 'message_ids': {'$filter': {
+                    'input': {'$ifNull': ['$message_ids', []]}, 'cond': {'$gt': ['$$this', above]}
+                }}}}
+            ]
+            documents = await cls.message_ids_cache.aggregate(pipeline).to_list(length=1)
+            document = documents[0] if documents else None
+            pending = [msg_id for msg_id in pending if msg_id > above]
+        else:
+            document = await cls.message_ids_cache.find_one({'_id': channel_id}, projection={'message_ids': 1, '_id': 0})
+        message_ids = document.get('message_ids', []) if document else []
+        return message_ids + pending
+
+    @classmethod
+    async def get_message_ids_high_water(cls, channel_id):
+        """Returns the newest message ID a completed scan has covered for the channel, or 0."""
+        if cls.message_ids_cache is None: return 0
+        document = await cls.message_ids_cache.find_one({'_id': channel_id}, projection={'high_water': 1, '_id': 0})
+        return document.get('high_water', 0) if document else 0
+
+    @classmethod
+    async def set_message_ids_high_water(cls, channel_id, message_id):
+        if cls.message_ids_cache is not None:
+            await cls.message_ids_cache.update_one({'_id': channel_id}, {'$max': {'high_water': message_id}}, upsert=True)
 
     @classmethod
     async def update_cached_message_ids(cls, channel_id, new_ids):
+        """Buffers message IDs for the channel; they are written by the background flusher."""
         if cls.message_ids_cache is not None:
-            await cls.message_ids_cache.update_one({'_id': channel_id}, {'$addToSet': {'message_ids': {'$each': new_ids}}}, upsert=True)
+            cls._message_ids_buffer.setdefault(channel_id, []).extend(new_ids)
 
     @classmethod
     async def clear_cached_message_ids(cls, channel_id):
+        cls._message_ids_buffer.pop(channel_id, None)
         if cls.message_ids_cache is not None:
             await cls.message_ids_cache.delete_one({'_id': channel_id})
 
     @classmethod
     async def clear_media_data_for_channel(cls, channel_id):
         if cls.db is None: return
-        post_prefix = f"post_{channel_id}_"
-        post_docs = await cls.task_collection.find({'_id': {'$regex': f'^{post_prefix}'}}).to_list(length=None)
-        if not post_docs: return
-        titles_to_delete = [doc['canonical_title'] for doc in post_docs]
+        post_filter = {'type': {'$in': POST_TYPES}, 'channel_id': channel_id}
+        # Only the titles are needed, so let the server collect them
+        titles_to_delete = await cls.task_collection.distinct('canonical_title', post_filter)
         if titles_to_delete:
-            await cls.media_collection.delete_many({'_id': {'$in': titles_to_delete}})
-            await cls.task_collection.delete_many({'_id': {'$regex': f'^{post_prefix}'}})
-            LOGGER.info(f"Cleared media and post data for {len(titles_to_delete)} titles from channel {channel_id}.")
+            # The two collections are independent; overlap both deletes
+            await asyncio.gather(
+                cls.media_collection.delete_many({'_id': {'$in': titles_to_delete}}),
+                cls.task_collection.delete_many(post_filter)
+            )
+            LOGGER.info("Cleared media and post data for %s titles from channel %s.", len(titles_to_delete), channel_id)
+
+    @classmethod
+    def _buffer_media_update(cls, canonical_title, display_title, inc=None, add_to_set=None):
+        """Merges one entry's update into the pending upsert for its title."""
+        fields = cls._media_buffer.get(canonical_title)
+        if fields is None:
+            fields = cls._media_buffer[canonical_title] = {'set': {}, 'inc': {}, 'addToSet': {}}
+        fields['set']['display_title'] = display_title
+        for key, amount in (inc or {}).items():
+            fields['inc'][key] = fields['inc'].get(key, 0) + amount
+        for key, value in (add_to_set or {}).items():
+            values = fields['addToSet'].setdefault(key, [])
+            if value not in values:
+                values.append(value)
+        cls._media_pending += 1
 
     @classmethod
     async def add_media_entry(cls, parsed_data, file_size, msg_id):
+        """Buffers a media entry; entries for the same title are merged into one upsert."""
         if cls.media_collection is None: return
         
         canonical_title = parsed_data['canonical_title']
@@ -99,18 +380,17 @@ class MongoDB:
             encoder = parsed_data.get('encoder', 'Unknown')
             quality_key = f"{quality} {codec}"
             
-            update_query = {
-                '$set': {'display_title': display_title},
-                '$inc': {
+            cls._buffer_media_update(
+                canonical_title, display_title,
+                inc={
                     f'seasons.{season}.qualities.{quality_key}.size': file_size,
                     'total_size': file_size
                 },
-                '$addToSet': {
+                add_to_set={
                     f'seasons.{season}.qualities.{quality_key}.episodes_by_encoder.{encoder}': episode,
                     f'seasons.{season}.episodes': episode
                 }
-            }
-            await cls.media_collection.update_one({'_id': canonical_title}, update_query, upsert=True)
+            )
             
         elif parsed_data['type'] == 'movie':
             version_data = {
@@ -122,46 +402,49 @@ class MongoDB:
                 'size': file_size,
                 'msg_id': msg_id
             }
-            update_query = {
-                '$set': {'display_title': display_title},
-                '$addToSet': {'versions': version_data}
-            }
-            await cls.media_collection.update_one({'_id': canonical_title}, update_query, upsert=True)
+            cls._buffer_media_update(canonical_title, display_title, add_to_set={'versions': version_data})
+
+        if cls._media_pending >= MEDIA_FLUSH_THRESHOLD:
+            try:
+                await cls.flush_media_entries()
+            except Exception as e:
+                # The entries stay buffered; the background flusher retries them
+                LOGGER.error("Failed to flush media entries, will retry: %s", e)
             
     @classmethod
     async def get_or_create_season_post(cls, canonical_title, display_title, channel_id, season_num):
         if cls.task_collection is None: return None
-        doc_id = f"post_{channel_id}_{canonical_title.lower().replace(' ', '_')}_s{season_num}"
-        post = await cls.task_collection.find_one({'_id': doc_id})
-        if not post:
-            post = {
-                '_id': doc_id,
+        doc_id = f"post_{channel_id}_{_slug(canonical_title)}_s{season_num}"
+        return await cls.task_collection.find_one_and_update(
+            {'_id': doc_id},
+            {'$setOnInsert': {
                 'canonical_title': canonical_title,
                 'display_title': display_title,
                 'channel_id': channel_id,
                 'type': 'series_season',
                 'season': season_num,
                 'message_id': None
-            }
-            await cls.task_collection.insert_one(post)
-        return post
+            }},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
 
     @classmethod
     async def get_or_create_movie_post(cls, canonical_title, display_title, channel_id):
         if cls.task_collection is None: return None
-        doc_id = f"post_{channel_id}_{canonical_title.lower().replace(' ', '_')}"
-        post = await cls.task_collection.find_one({'_id': doc_id})
-        if not post:
-            post = {
-                '_id': doc_id,
+        doc_id = f"post_{channel_id}_{_slug(canonical_title)}"
+        return await cls.task_collection.find_one_and_update(
+            {'_id': doc_id},
+            {'$setOnInsert': {
                 'canonical_title': canonical_title,
                 'display_title': display_title,
                 'channel_id': channel_id,
                 'type': 'movie',
                 'message_id': None
-            }
-            await cls.task_collection.insert_one(post)
-        return post
+            }},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
 
     @classmethod
     async def update_post_message_id(cls, post_id, message_id):
@@ -169,6 +452,9 @@ class MongoDB:
 
     @classmethod
     async def get_media_data(cls, title):
+        # Make sure buffered entries for this title, including ones another flush
+        # has already swapped out but not yet written, are visible before reading
+        if title in cls._media_buffer or cls._media_lock.locked(): await cls.flush_media_entries()
         if cls.media_collection is not None: return await cls.media_collection.find_one({'_id': title})
         return None
 
@@ -178,9 +464,27 @@ class MongoDB:
     
     @classmethod
     async def get_status_message(cls):
-        if cls.task_collection is not None: return await cls.task_collection.find_one({'_id': 'status_message_tracker'})
+        if cls.task_collection is not None: return await cls.task_collection.find_one({'_id': 'status_message_tracker'}, projection={'chat_id': 1, 'message_id': 1, '_id': 0})
         return None
 
+    @classmethod
+    async def get_status_and_scans(cls):
+        """Fetches the status message tracker and all active scans in one round-trip."""
+        if cls.task_collection is None: return None, []
+        if cls._active_scans_cache is not None:
+            return await cls.get_status_message(), list(cls._active_scans_cache.values())
+        pipeline = [
+            {'$match': {'$or': [{'_id': 'status_message_tracker'}, {'type': 'active_scan'}]}},
+            {'$facet': {
+                'status': [{'$match': {'_id': 'status_message_tracker'}}, {'$limit': 1}, {'$project': {'chat_id': 1, 'message_id': 1}}],
+                'scans': [{'$match': {'type': 'active_scan'}}]
+            }}
+        ]
+        result = await cls.task_collection.aggregate(pipeline).to_list(length=1)
+        if not result: return None, []
+        status = result[0]['status']
+        return (status[0] if status else None), result[0]['scans']
+
     @classmethod
     async def delete_status_message_tracker(cls):
         if cls.task_collection is not None: await cls.task_collection.delete_one({'_id': 'status_message_tracker'})
@@ -192,7 +496,7 @@ class MongoDB:
     @classmethod
     async def get_failed_ids(cls, channel_id):
         if cls.task_collection is not None:
-            doc = await cls.task_collection.find_one({'_id': f"failed_{channel_id}", 'type': 'failed_job'})
+            doc = await cls.task_collection.find_one({'_id': f"failed_{channel_id}", 'type': 'failed_job'}, projection={'failed_ids': 1, '_id': 0})
             return doc.get('failed_ids', []) if doc else []
         return []
 
@@ -202,7 +506,8 @@ class MongoDB:
 
     @classmethod
     async def start_scan(cls, scan_id, channel_id, user_id, total_messages, chat_title, operation):
-        if cls.task_collection is not None: await cls.task_collection.update_one({'_id': scan_id}, {'$set': {'type': 'active_scan', 'operation': operation, 'channel_id': channel_id, 'user_id': user_id, 'total_messages': total_messages, 'processed_messages': 0, 'chat_title': chat_title}}, upsert=True)
+        # Idempotent: re-starting an existing scan_id resets it instead of raising on a duplicate key
+        if cls.task_collection is not None: await cls.task_collection.update_one({'_id': scan_id}, {'$set': {'type': 'active_scan', 'operation': operation, 'channel_id': channel_id, 'user_id': user_id, 'total_messages': total_messages, 'processed_messages': 0, 'chat_title': chat_title}, '$setOnInsert': {'created_at': datetime.now(timezone.utc)}}, upsert=True)
 
     @classmethod
     async def update_scan_total(cls, scan_id, total_messages):
@@ -210,16 +515,20 @@ class MongoDB:
 
     @classmethod
     async def update_scan_progress(cls, scan_id, processed_count):
-        if cls.task_collection is not None: await cls.task_collection.update_one({'_id': scan_id, 'type': 'active_scan'}, {'$set': {'processed_messages': processed_count}})
+        """Records the latest progress for a scan; only the newest value is flushed."""
+        if cls.task_collection is not None: cls._progress_buffer[scan_id] = processed_count
 
     @classmethod
     async def end_scan(cls, scan_id):
+        cls._progress_buffer.pop(scan_id, None)
         if cls.task_collection is not None: await cls.task_collection.delete_one({'_id': scan_id, 'type': 'active_scan'})
 
     @classmethod
-    async def get_active_scans(cls):
-        if cls.task_collection is not None: return await cls.task_collection.find({'type': 'active_scan'}).to_list(length=None)
-        return []
+    async def iter_active_scans(cls, projection=None):
+        """Streams active scans from a cursor, optionally projecting only the given fields."""
+        if cls.task_collection is None: return
+        async for doc in cls.task_collection.find({'type': 'active_scan'}, projection=projection).batch_size(128):
+            yield doc
 
     @classmethod
     async def set_scan_flood_wait(cls, scan_id, end_time):
@@ -24,14 +24,7 @@ class AuthFilters:
         if uid == Config.OWNER_ID:
             return True
         
-        # Check authorized chats
-        if Config.AUTHORIZED_CHATS:
-            try:
-                authorized_ids = [int(x.strip()) for x in Config.AUTHORIZED_CHATS.split(',') if x.strip()]
-                return uid in authorized_ids
-            except (ValueError, AttributeError):
-                pass
-        
-        return False
+        # Check authorized chats (parsed once by Config)
+        return uid in Config.AUTHORIZED_IDS
     
     authorized = create(authorized_user)
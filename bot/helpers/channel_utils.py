@@ -3,84 +3,133 @@ Utilities for handling channel message history with an ID-based batching approac
 """
 import logging
 import asyncio
+from collections import deque
+from pyrogram.errors import FloodWait
 from bot.core.client import TgClient
 from bot.database.mongodb import MongoDB
 
 LOGGER = logging.getLogger(__name__)
 
+# Record processed message IDs in the cache every N yielded batches (and at the end)
+CACHE_FLUSH_BATCHES = 10
+# How many get_messages batches may be in flight ahead of the consumer
+PREFETCH_BATCHES = 4
+
+def _id_batches(last_id, high_water, skip_ids):
+    """Yields descending 100-ID batches above the high-water mark, minus already cached IDs."""
+    current_id = last_id
+    while current_id > high_water:
+        message_ids = range(current_id, max(high_water, current_id - 100), -1)
+        current_id -= 100 # Move to the next batch
+
+        ids_to_fetch = [msg_id for msg_id in message_ids if msg_id not in skip_ids]
+        if not ids_to_fetch:
+            LOGGER.info("Skipping batch as all message IDs are already cached.")
+            continue
+        yield ids_to_fetch
+
 async def stream_messages_by_id_batches(channel_id, force=False):
     """
     Asynchronously yields batches of messages by fetching them in ID ranges using the bot session.
-    This is highly efficient and avoids FloodWaits.
+    Batches are fetched back to back; FloodWaits are honoured as Telegram reports them.
 
     :param channel_id: The ID of the target channel.
     :param force: If True, ignores the cache and re-processes all messages.
     :return: An asynchronous generator that yields lists of message objects.
     """
-    LOGGER.info(f"Starting ID-based message stream for channel {channel_id}. Force rescan: {force}")
+    LOGGER.info("Starting ID-based message stream for channel %s. Force rescan: %s", channel_id, force)
 
     if force:
         await MongoDB.clear_cached_message_ids(channel_id)
-        LOGGER.info(f"Cleared message ID cache for channel {channel_id} due to force rescan.")
+        LOGGER.info("Cleared message ID cache for channel %s due to force rescan.", channel_id)
 
-    cached_ids = set(await MongoDB.get_cached_message_ids(channel_id))
+    # Every ID up to the high-water mark was visited by an earlier, error-free scan,
+    # so only cached IDs above it are needed to skip already processed messages
+    high_water = 0 if force else await MongoDB.get_message_ids_high_water(channel_id)
+    cached_ids = set(await MongoDB.get_cached_message_ids(channel_id, above=high_water))
+    had_errors = False
+    ids_to_cache = []
+    batches_since_flush = 0
+    in_flight = deque()
     
     try:
         # Use user session once to get the total number of messages reliably.
         total_messages = await TgClient.user.get_chat_history_count(chat_id=channel_id)
         if total_messages == 0:
-            LOGGER.info(f"Channel {channel_id} is empty. Nothing to stream.")
+            LOGGER.info("Channel %s is empty. Nothing to stream.", channel_id)
             return
 
         # Start from the latest message ID
         last_message = await anext(TgClient.user.get_chat_history(chat_id=channel_id, limit=1))
         last_id = last_message.id if last_message else total_messages
 
-        current_id = last_id
-        
-        while current_id > 0:
-            # Define the batch of message IDs to fetch (e.g., 100 at a time)
-            message_ids = list(range(current_id, max(0, current_id - 100), -1))
-            current_id -= 100 # Move to the next batch
-
-            if not message_ids:
-                continue
-            
-            # Filter out IDs that are already cached, unless force scanning
-            if not force:
-                ids_to_fetch = [msg_id for msg_id in message_ids if msg_id not in cached_ids]
-            else:
-                ids_to_fetch = message_ids
-
-            if not ids_to_fetch:
-                LOGGER.info("Skipping batch as all message IDs are already cached.")
-                continue
+        # Filter out IDs that are already cached, unless force scanning
+        batches = _id_batches(last_id, high_water, set() if force else cached_ids)
+
+        def fetch_batch(ids):
+            # Use the BOT session for the high-rate get_messages call
+            return asyncio.create_task(TgClient.bot.get_messages(chat_id=channel_id, message_ids=ids))
 
+        def schedule_next():
+            ids = next(batches, None)
+            if ids is not None:
+                in_flight.append((ids, fetch_batch(ids)))
+
+        # Keep a few batches downloading while the consumer works on the current one;
+        # results are still yielded strictly in descending ID order
+        for _ in range(PREFETCH_BATCHES):
+            schedule_next()
+
+        while in_flight:
+            ids_to_fetch, fetch = in_flight.popleft()
+            schedule_next()
             try:
-                # Use the BOT session for the high-rate get_messages call
-                messages = await TgClient.bot.get_messages(chat_id=channel_id, message_ids=ids_to_fetch)
+                messages = await fetch
                 
                 # Filter out empty messages (deleted or service messages)
                 valid_messages = [msg for msg in messages if not msg.empty]
 
                 if valid_messages:
-                    LOGGER.info(f"Yielding batch of {len(valid_messages)} messages for channel {channel_id}.")
+                    LOGGER.info("Yielding batch of %s messages for channel %s.", len(valid_messages), channel_id)
                     yield valid_messages
                     
-                    # Cache the successfully processed message IDs
-                    ids_to_cache = [msg.id for msg in valid_messages]
-                    if ids_to_cache:
+                    # Cache the successfully processed message IDs, a few batches at a time
+                    ids_to_cache.extend(msg.id for msg in valid_messages)
+                    batches_since_flush += 1
+                    if batches_since_flush >= CACHE_FLUSH_BATCHES:
                         await MongoDB.update_cached_message_ids(channel_id, ids_to_cache)
-                
-                # A small sleep between batches to be respectful to the API
-                await asyncio.sleep(2)
+                        ids_to_cache, batches_since_flush = [], 0
+
+            except FloodWait as e:
+                # Telegram says exactly how long to back off. The other prefetched batches are likely
+                # hitting the same limit, so keep the ones that already succeeded, cancel the rest
+                # and re-issue the whole window after a single wait
+                LOGGER.warning("FloodWait of %ss while fetching messages in %s.", e.value, channel_id)
+                window = [(ids_to_fetch, None)]
+                for ids, pending in in_flight:
+                    if pending.done() and not pending.cancelled() and pending.exception() is None:
+                        window.append((ids, pending))
+                    else:
+                        pending.cancel()
+                        window.append((ids, None))
+                in_flight.clear()
+                await asyncio.sleep(e.value + 1)
+                in_flight.extend((ids, pending or fetch_batch(ids)) for ids, pending in window)
 
             except Exception as e:
-                LOGGER.error(f"Could not fetch message batch for IDs {ids_to_fetch} in {channel_id}: {e}")
+                had_errors = True
+                LOGGER.error("Could not fetch message batch for IDs %s in %s: %s", ids_to_fetch, channel_id, e)
                 # Wait a bit longer if an error occurs during a batch fetch
                 await asyncio.sleep(10)
                 
-        LOGGER.info(f"Finished ID-based message stream for channel {channel_id}.")
+        if not had_errors:
+            await MongoDB.set_message_ids_high_water(channel_id, last_id)
+        LOGGER.info("Finished ID-based message stream for channel %s.", channel_id)
 
     except Exception as e:
-        LOGGER.error(f"Critical error during message streaming for {channel_id}: {e}", exc_info=True)
+        LOGGER.error("Critical error during message streaming for %s: %s", channel_id, e, exc_info=True)
+    finally:
+        for _, fetch in in_flight:
+            fetch.cancel()
+        if ids_to_cache:
+            await MongoDB.update_cached_message_ids(channel_id, ids_to_cache)
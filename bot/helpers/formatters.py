@@ -2,18 +2,38 @@
 Formatting helpers to generate the text for index posts.
 """
 from datetime import datetime
-from collections import defaultdict
+from functools import lru_cache
 import logging
+import time
 
 LOGGER = logging.getLogger(__name__)
 
+# Tree-art prefixes shared by every formatted row
+_MID = "├─"
+_LAST = "└─"
+# 2**-30 is exact, so multiplying gives the same result as dividing by 1024**3
+_GB_INV = 1.0 / (1024 ** 3)
+
+@lru_cache(maxsize=1)
+def _timestamp(minute):
+    """Footer timestamp; it has minute resolution, so it is rendered once per minute."""
+    return datetime.now().strftime('%b %d, %Y %I:%M %p IST')
+
+def _last_updated():
+    return _timestamp(int(time.time()) // 60)
+
 def format_season_post(title, season_num, season_data, total_episodes_map):
     """Formats the text for a single season post."""
-    expected_eps = total_episodes_map.get(title, {}).get(season_num, len(season_data.get('episodes', [])))
-    text = f"**{title} - Season {season_num}** ({expected_eps} Episodes)\n\n"
+    per_title_eps = total_episodes_map.get(title)
+    if per_title_eps and season_num in per_title_eps:
+        expected_eps = per_title_eps[season_num]
+    else:
+        expected_eps = len(season_data.get('episodes', ()))
+    parts = [f"**{title} - Season {season_num}** ({expected_eps} Episodes)\n\n"]
     
     qualities = season_data.get('qualities', {})
     sorted_qualities = sorted(qualities.keys())
+    last_quality = len(sorted_qualities) - 1
 
     for i, quality_key in enumerate(sorted_qualities):
         quality_data = qualities[quality_key]
@@ -24,41 +44,44 @@ def format_season_post(title, season_num, season_data, total_episodes_map):
         sorted_encoders = sorted([enc for enc in episodes_by_encoder.keys() if enc != 'Unknown'])
         if 'Unknown' in episodes_by_encoder:
             sorted_encoders.append('Unknown')
+        # Only the final encoder of the final quality closes the tree
+        last_encoder = len(sorted_encoders) - 1 if i == last_quality else -1
 
         for j, encoder in enumerate(sorted_encoders):
             # Determine the prefix for the line
-            is_last_quality = (i == len(sorted_qualities) - 1)
-            is_last_encoder = (j == len(sorted_encoders) - 1)
-            prefix = "└─" if is_last_quality and is_last_encoder else "├─"
+            prefix = _LAST if j == last_encoder else _MID
             
-            ep_range = get_episode_range(sorted(episodes_by_encoder[encoder]))
+            # get_episode_range de-duplicates and sorts on its own
+            ep_range = get_episode_range(episodes_by_encoder[encoder])
             
             if encoder == 'Unknown':
                 details_line = f"**{quality_key}**: {ep_range}\n"
             else:
                 details_line = f"**{quality_key}** ({encoder}): {ep_range}\n"
 
-            text += f"{prefix} {details_line}"
+            parts.append(f"{prefix} {details_line}")
 
-    text += f"\nLast Updated: {datetime.now().strftime('%b %d, %Y %I:%M %p IST')}"
-    return text
+    parts.append(f"\nLast Updated: {_last_updated()}")
+    return "".join(parts)
 
 
 def format_movie_post(title, data):
-    text = f"**{title}**\n\n"
+    parts = [f"**{title}**\n\n"]
     if 'versions' in data:
-        for i, version_data in enumerate(data['versions']):
-            prefix = "└─" if i == len(data['versions']) - 1 else "├─"
+        versions = data['versions']
+        last_version = len(versions) - 1
+        for i, version_data in enumerate(versions):
+            prefix = _LAST if i == last_version else _MID
             quality_line = f"**{version_data['quality']} {version_data['codec']}**"
             if version_data['encoder'] != 'Unknown': quality_line += f" ({version_data['encoder']})"
-            size_gb = version_data.get('size', 0) / (1024**3)
-            text += f"{prefix} {quality_line} ({size_gb:.1f}GB)\n"
-    text += f"\nLast Updated: {datetime.now().strftime('%b %d, %Y %I:%M %p IST')}"
-    return text
+            size_gb = version_data.get('size', 0) * _GB_INV
+            parts.append(f"{prefix} {quality_line} ({size_gb:.1f}GB)\n")
+    parts.append(f"\nLast Updated: {_last_updated()}")
+    return "".join(parts)
 
 def get_episode_range(episodes):
     if not episodes: return ""
-    episodes = sorted(list(set(episodes)))
+    episodes = sorted(set(episodes))
     ranges = []
     start = end = episodes[0]
     for ep in episodes[1:]:
@@ -3,6 +3,7 @@ Advanced parser for media filenames and captions with improved movie/series dete
 """
 import re
 import logging
+from functools import lru_cache
 from bot.core.config import Config
 from bot.helpers.tvmaze_utils import tvmaze_api
 
@@ -84,15 +85,48 @@ IGNORED_TAGS = {
     'AMZNWebDL', 'DS4K', 'SDR', 'DDP5.1', '[EZTVx.to]'
 }
 
+# --- Patterns compiled once at import ---
+_CANONICAL_YEAR_RE = re.compile(r'[\s._-]*\(\d{4}\)[\s._-]*')
+_CANONICAL_STRIP_RE = re.compile(r'[:()]')
+_WORD_SPLIT_RE = re.compile(r'[\s._-]+')
+_TITLE_SEP_RE = re.compile(r'[\._]')
+_VOL_TAG_RE = re.compile(r'[._\s]Vol[\s._]\d+', re.IGNORECASE)
+_SPLIT_EXT_FIRST_RE = re.compile(r'^(.*)\.(mkv|mp4|avi|mov)\.(\d{3})$', re.IGNORECASE)
+_SPLIT_NUM_FIRST_RE = re.compile(r'^(.*)\.(\d{3})\.(mkv|mp4|avi|mov)$', re.IGNORECASE)
+_SPLIT_PART_RE = re.compile(r'^(.*)\.part(\d+)\.(mkv|mp4|avi|mov)$', re.IGNORECASE)
+# FIX: More robust series patterns to handle multiple formats
+# S01E01, S01.E01, S01-E01
+_SERIES_RE = re.compile(r'(.+?)[ ._\[\(-][sS](\d{1,2})[ ._]?[eE](\d{1,3})(?:-[eE]?(\d{1,3}))?', re.IGNORECASE)
+# EP01 (with season)
+_SERIES_EP_RE = re.compile(r'(.+?)[ ._\[\(-][sS](\d{1,2})[ ._]?EP(\d{1,3})', re.IGNORECASE)
+# EP01 (without season - assumes S01)
+_SEASONLESS_EP_RE = re.compile(r'(.+?)[ ._\[\(]EP(\d{1,3})', re.IGNORECASE)
+_MOVIE_RE = re.compile(r'(.+?)[ ._\[\(](\d{4})[ ._\]\)]', re.IGNORECASE)
+# When several codecs appear, the highest priority wins (AV1 > VP9 > X265 > X264)
+_CODEC_PRIORITY = {'AV1': 0, 'VP9': 1, 'X265': 2, 'X264': 3}
+# Quality and codec tokens in one alternation, so each text is scanned once
+_QUALITY_CODEC_RE = re.compile(
+    r'\b(?:(?P<quality>4K|2160p|1080p|960p|720p|576p|540p|480p|404p)'
+    r'|(?P<AV1>AV1)|(?P<VP9>VP9)'
+    # FIX: More flexible regex for H.265/x265
+    r'|(?P<X265>HEVC|x265|H[\s._]?265)'
+    r'|(?P<X264>AVC|x264|H[\s._]?264))\b',
+    re.IGNORECASE
+)
+_EXTENSION_RE = re.compile(r'\.\w+$')
+_TAG_SPLIT_RE = re.compile(r'[ ._\[\]()\-]+')
+
+# Releases in a channel repeat the same names and caption templates, so parses are memoized
+PARSE_CACHE_SIZE = 8192
 
 def _get_canonical_title(title):
     """Creates a normalized title for consistent grouping."""
     # FIX: More aggressive cleaning to remove year and special characters
-    title = re.sub(r'[\s._-]*\(\d{4}\)[\s._-]*', ' ', title)
-    title = re.sub(r'[:()]', '', title)
+    title = _CANONICAL_YEAR_RE.sub(' ', title)
+    title = _CANONICAL_STRIP_RE.sub('', title)
     return title.strip().rstrip('-').strip()
 
-def parse_media_info(filename, caption=None):
+async def parse_media_info(filename, caption=None):
     """
     Intelligently parses media info and enriches it with TVMaze data.
     """
@@ -116,7 +150,7 @@ def parse_media_info(filename, caption=None):
     words_to_exclude = set()
 
     if 'title' in final_info:
-        show_data = tvmaze_api.get_minimal_info(final_info['title'])
+        show_data = await tvmaze_api.get_minimal_info(final_info['title'])
         if show_data:
             # FIX: Use TVMaze title only if the config allows it
             if Config.USE_TVMAZE_TITLES:
@@ -126,7 +160,7 @@ def parse_media_info(filename, caption=None):
                 official_title = final_info['title']
 
             # FIX: Add all words from the official title to an exclusion list
-            for word in re.split(r'[\s._-]+', official_title.upper()):
+            for word in _WORD_SPLIT_RE.split(official_title.upper()):
                 words_to_exclude.add(word)
 
             if not final_info.get('year') and show_data.get('premiered'):
@@ -139,7 +173,7 @@ def parse_media_info(filename, caption=None):
                         episode_title = episode_info.get('title')
                         if episode_title:
                             # Also add all words from the episode title to the exclusion list
-                            for word in re.split(r'[\s._-]+', episode_title.upper()):
+                            for word in _WORD_SPLIT_RE.split(episode_title.upper()):
                                 words_to_exclude.add(word)
                         break
 
@@ -169,100 +203,99 @@ def parse_media_info(filename, caption=None):
 
     return final_info
 
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
 def get_base_name(filename):
     # Match format like .mkv.001
-    match_ext_first = re.search(r'^(.*)\.(mkv|mp4|avi|mov)\.(\d{3})$', filename, re.IGNORECASE)
+    match_ext_first = _SPLIT_EXT_FIRST_RE.search(filename)
     if match_ext_first:
         return f"{match_ext_first.group(1)}.{match_ext_first.group(2)}", True
         
     # Match format like .001.mkv
-    match_num_first = re.search(r'^(.*)\.(\d{3})\.(mkv|mp4|avi|mov)$', filename, re.IGNORECASE)
+    match_num_first = _SPLIT_NUM_FIRST_RE.search(filename)
     if match_num_first:
         return f"{match_num_first.group(1)}.{match_num_first.group(3)}", True
         
     # Match format like ...part001.mkv
-    match_part_num = re.search(r'^(.*)\.part(\d+)\.(mkv|mp4|avi|mov)$', filename, re.IGNORECASE)
+    match_part_num = _SPLIT_PART_RE.search(filename)
     if match_part_num:
         return f"{match_part_num.group(1)}.{match_part_num.group(3)}", True
         
     return filename, False
 
 def extract_info_from_text(text):
+    info = _extract_info(text)
+    if info is None:
+        return None
+    # Hand out a copy so callers can't modify the cached entry
+    return {key: list(value) if isinstance(value, list) else value for key, value in info.items()}
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _extract_info(text):
     if not text:
         return None
 
     # FIX: Remove decorative tags like "Vol. 01" before parsing
-    cleaned_text = re.sub(r'[._\s]Vol[\s._]\d+', ' ', text, flags=re.IGNORECASE)
-
-    # FIX: More robust series patterns to handle multiple formats
-    patterns = [
-        # S01E01, S01.E01, S01-E01
-        re.compile(r'(.+?)[ ._\[\(-][sS](\d{1,2})[ ._]?[eE](\d{1,3})(?:-[eE]?(\d{1,3}))?', re.IGNORECASE),
-        # EP01 (with season)
-        re.compile(r'(.+?)[ ._\[\(-][sS](\d{1,2})[ ._]?EP(\d{1,3})', re.IGNORECASE),
-        # EP01 (without season - assumes S01)
-        re.compile(r'(.+?)[ ._\[\(]EP(\d{1,3})', re.IGNORECASE)
-    ]
-
-    series_match = None
-    is_seasonless = False
-    for pattern in patterns:
-        series_match = pattern.search(cleaned_text)
-        if series_match:
-            if 'EP' in pattern.pattern and 'sS' not in pattern.pattern:
-                is_seasonless = True
-            break
-            
-    movie_pattern = re.compile(r'(.+?)[ ._\[\(](\d{4})[ ._\]\)]', re.IGNORECASE)
-    movie_match = movie_pattern.search(cleaned_text)
-    
-    quality = get_quality(cleaned_text)
-    codec = get_codec(cleaned_text)
-    encoder = get_encoder(cleaned_text) # Returns a list now
+    cleaned_text = _VOL_TAG_RE.sub(' ', text)
 
+    # Try the series patterns in priority order
+    series_match = _SERIES_RE.search(cleaned_text)
     if series_match:
-        if is_seasonless:
-            title_part, start_ep_str = series_match.groups()
-            season_str = "1" # Assume Season 1
-            end_ep_str = None
-        elif 'EP' in series_match.re.pattern:
+        title_part, season_str, start_ep_str, end_ep_str = series_match.groups()
+    else:
+        series_match = _SERIES_EP_RE.search(cleaned_text)
+        if series_match:
             title_part, season_str, start_ep_str = series_match.groups()
             end_ep_str = None
         else:
-            title_part, season_str, start_ep_str, end_ep_str = series_match.groups()
+            series_match = _SEASONLESS_EP_RE.search(cleaned_text)
+            if series_match:
+                title_part, start_ep_str = series_match.groups()
+                season_str = "1" # Assume Season 1
+                end_ep_str = None
 
-        title = re.sub(r'[\._]', ' ', title_part).strip().title()
+    quality, codec = get_quality_and_codec(cleaned_text)
+    encoder = get_encoder(cleaned_text) # Returns a list now
+
+    if series_match:
+        title = _TITLE_SEP_RE.sub(' ', title_part).strip().title()
         season = int(season_str)
         start_ep = int(start_ep_str)
         episodes = list(range(start_ep, int(end_ep_str) + 1)) if end_ep_str else [start_ep]
         return {'title': title, 'season': season, 'episodes': episodes, 'quality': quality, 'codec': codec, 'encoder': encoder, 'type': 'series'}
 
+    movie_match = _MOVIE_RE.search(cleaned_text)
     if movie_match:
         title, year = movie_match.groups()
         return {'title': title.replace('.', ' ').strip().title(), 'year': int(year), 'quality': quality, 'codec': codec, 'encoder': encoder, 'type': 'movie'}
     
     # Return encoder as a list even for partial matches
-    encoder_list = get_encoder(cleaned_text)
-    if any(val != 'Unknown' for val in [quality, codec]) or encoder_list[0] != 'Unknown':
-        return {'quality': quality, 'codec': codec, 'encoder': encoder_list}
+    if quality != 'Unknown' or codec != 'Unknown' or encoder[0] != 'Unknown':
+        return {'quality': quality, 'codec': codec, 'encoder': encoder}
 
 
     return None
 
 def get_quality(text):
-    match = re.search(r'\b(4K|2160p|1080p|960p|720p|576p|540p|480p|404p)\b', text, re.IGNORECASE)
-    if match:
-        quality = match.group(1).upper()
-        return "4K" if "2160" in quality else quality
-    return 'Unknown'
+    return get_quality_and_codec(text)[0]
 
 def get_codec(text):
-    if re.search(r'\b(AV1)\b', text, re.IGNORECASE): return 'AV1'
-    if re.search(r'\b(VP9)\b', text, re.IGNORECASE): return 'VP9'
-    # FIX: More flexible regex for H.265/x265
-    if re.search(r'\b(HEVC|x265|H[\s._]?265)\b', text, re.IGNORECASE): return 'X265'
-    if re.search(r'\b(AVC|x264|H[\s._]?264)\b', text, re.IGNORECASE): return 'X264'
-    return 'Unknown'
+    return get_quality_and_codec(text)[1]
+
+def get_quality_and_codec(text):
+    """Finds the first quality tag and the highest-priority codec in a single regex pass."""
+    quality = codec = None
+    for match in _QUALITY_CODEC_RE.finditer(text):
+        kind = match.lastgroup
+        if kind == 'quality':
+            if quality is None:
+                quality = match.group(kind).upper()
+        elif codec is None or _CODEC_PRIORITY[kind] < _CODEC_PRIORITY[codec]:
+            codec = kind
+    if quality is None:
+        quality = 'Unknown'
+    elif "2160" in quality:
+        quality = "4K"
+    return quality, codec or 'Unknown'
 
 def get_encoder(text, words_to_exclude=None, limit=2):
     """
@@ -272,10 +305,10 @@ def get_encoder(text, words_to_exclude=None, limit=2):
     if words_to_exclude is None:
         words_to_exclude = set()
 
-    text_without_ext = re.sub(r'\.\w+$', '', text)
+    text_without_ext = _EXTENSION_RE.sub('', text)
     
     # --- NEW LOGIC: Only scan the last three potential tags ---
-    potential_tags = re.split(r'[ ._\[\]()\-]+', text_without_ext)
+    potential_tags = _TAG_SPLIT_RE.split(text_without_ext)
     scan_tags = [tag for tag in potential_tags if tag][-3:]
     
     found_encoders = []
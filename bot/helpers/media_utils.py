@@ -52,5 +52,5 @@ async def extract_mediainfo(file_path):
         return result
         
     except Exception as e:
-        LOGGER.error(f"MediaInfo extraction error: {e}")
+        LOGGER.error("MediaInfo extraction error: %s", e)
         return {}
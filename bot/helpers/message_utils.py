@@ -19,11 +19,11 @@ async def send_message(message, text, keyboard=None):
             disable_web_page_preview=True
         )
     except FloodWait as e:
-        LOGGER.warning(f"FloodWait: {e.value} seconds")
+        LOGGER.warning("FloodWait: %s seconds", e.value)
         await asyncio.sleep(e.value)
         return await send_message(message, text, keyboard)
     except Exception as e:
-        LOGGER.error(f"Send message error: {e}")
+        LOGGER.error("Send message error: %s", e)
         return None
 
 async def edit_message(message, text, keyboard=None):
@@ -43,7 +43,7 @@ async def edit_message(message, text, keyboard=None):
             await asyncio.sleep(e.value)
             return await edit_message(message, text, keyboard)
     except Exception as e:
-        LOGGER.error(f"Edit message error: {e}")
+        LOGGER.error("Edit message error: %s", e)
         return None
 
 async def send_reply(message, text):
@@ -55,9 +55,9 @@ async def send_reply(message, text):
             disable_web_page_preview=True
         )
     except FloodWait as e:
-        LOGGER.warning(f"FloodWait on reply: {e.value} seconds")
+        LOGGER.warning("FloodWait on reply: %s seconds", e.value)
         await asyncio.sleep(e.value)
         return await send_reply(message, text)
     except Exception as e:
-        LOGGER.error(f"Send reply error: {e}")
+        LOGGER.error("Send reply error: %s", e)
         return None
@@ -2,39 +2,42 @@
 TVMaze API integration for fetching series and movie data with caching.
 """
 
+import asyncio
 import logging
-from pytvmaze.tvmaze import TVMaze as PyTVMaze, ShowNotFound
+from bot.core.client import TgClient
 from bot.database.mongodb import MongoDB
 
 LOGGER = logging.getLogger(__name__)
 
-def _get_minimal_show_data(show_obj):
+TVMAZE_SINGLESEARCH_URL = "https://api.tvmaze.com/singlesearch/shows"
+TVMAZE_MAX_RETRIES = 5
+
+def _get_minimal_show_data(show):
     """
-    Safely converts a pytvmaze show object into the minimal dictionary we need.
+    Safely converts a TVMaze show payload into the minimal dictionary we need.
     This is not recursive and explicitly extracts fields to avoid errors.
     """
-    if not show_obj:
+    if not show:
         return None
-    
+
     # Safely determine the show type
-    show_type = 'series' if getattr(show_obj, 'type', '') == 'Scripted' else 'movie'
-    
+    show_type = 'series' if show.get('type') == 'Scripted' else 'movie'
+
     # Safely extract episode details into a clean list of dicts
     episodes = []
-    if hasattr(show_obj, 'episodes'):
-        for ep in show_obj.episodes:
-            episodes.append({
-                'season_number': getattr(ep, 'season_number', None),
-                'episode_number': getattr(ep, 'episode_number', None),
-                'title': getattr(ep, 'title', 'Unknown')
-            })
-            
+    for ep in (show.get('_embedded') or {}).get('episodes', []):
+        episodes.append({
+            'season_number': ep.get('season'),
+            'episode_number': ep.get('number'),
+            'title': ep.get('name')
+        })
+
     # Build the final, clean dictionary
     minimal_data = {
-        'maze_id': getattr(show_obj, 'maze_id', None),
-        'name': getattr(show_obj, 'name', 'Unknown'),
+        'maze_id': show.get('id'),
+        'name': show.get('name', 'Unknown'),
         'type': show_type,
-        'premiered': getattr(show_obj, 'premiered', None),
+        'premiered': show.get('premiered'),
         'episodes': episodes
     }
     return minimal_data
@@ -42,32 +45,43 @@ def _get_minimal_show_data(show_obj):
 class TVMaze:
     """A helper class for interacting with the TVMaze API with MongoDB caching."""
 
-    def __init__(self):
-        self.api = PyTVMaze()
+    async def _search_show(self, title):
+        """Queries the TVMaze single search endpoint over the shared HTTP pool."""
+        params = {'q': title, 'embed': 'episodes'}
+        for attempt in range(TVMAZE_MAX_RETRIES):
+            response = await TgClient.http.get(TVMAZE_SINGLESEARCH_URL, params=params)
+            if response.status_code == 429:
+                # Rate limited, back off and retry
+                await asyncio.sleep(0.1 * 2 ** attempt)
+                continue
+            if response.status_code in (404, 422):
+                return None
+            response.raise_for_status()
+            return response.json()
+        response.raise_for_status()
 
-    def get_minimal_info(self, title):
+    async def get_minimal_info(self, title):
         """
         Fetches minimal show info (type and episodes) for a given title, using a cache.
         """
-        cached_result = MongoDB.get_tvmaze_cache(title)
+        cached_result = await MongoDB.get_tvmaze_cache(title)
         if cached_result:
-            LOGGER.info(f"Found '{title}' in TVMaze cache.")
+            LOGGER.info("Found '%s' in TVMaze cache.", title)
             return cached_result.get('data')
 
-        LOGGER.info(f"'{title}' not in cache. Querying TVMaze API.")
+        LOGGER.info("'%s' not in cache. Querying TVMaze API.", title)
         try:
-            show = self.api.get_show(show_name=title, embed='episodes')
+            show = await self._search_show(title)
             if show:
-                # Use the new safe function to get a clean dictionary
+                # Use the safe function to get a clean dictionary
                 minimal_data = _get_minimal_show_data(show)
                 if minimal_data:
-                    MongoDB.set_tvmaze_cache(title, minimal_data)
+                    await MongoDB.set_tvmaze_cache(title, minimal_data)
                 return minimal_data
-        except ShowNotFound:
-            LOGGER.warning(f"Show '{title}' not found on TVMaze.")
+            LOGGER.warning("Show '%s' not found on TVMaze.", title)
         except Exception as e:
             # Log the full traceback for better debugging
-            LOGGER.error(f"TVMaze API error while searching for '{title}': {e}", exc_info=True)
+            LOGGER.error("TVMaze API error while searching for '%s': %s", title, e, exc_info=True)
 
         return None
 
@@ -16,6 +16,13 @@ LOGGER = logging.getLogger(__name__)
 # --- CONFIGURATION ---
 FILES_PER_UPDATE = 1000  # Send an update file after this many files are scanned
 
+_TAG_SPLIT_RE = re.compile(r'[ ._\[\]()\-]+')
+_TRAILING_SEP_RE = re.compile(r'[._\[\]()\-]+$')
+# Episode markers, resolutions and years are never encoder tags
+_NON_ENCODER_RE = re.compile(r'S\d{1,2}(E\d{1,3})?|\d{3,4}P|\d{4}')
+_KNOWN_ENCODERS_UPPER = frozenset(enc.upper() for enc in KNOWN_ENCODERS)
+_IGNORED_TAGS_UPPER = frozenset(tag.upper() for tag in IGNORED_TAGS)
+
 async def findencoders_handler(client, message):
     """
     Handler for the /findencoders command.
@@ -41,7 +48,7 @@ async def findencoders_handler(client, message):
 
         if is_force_rescan:
             await MongoDB.clear_cached_message_ids(channel_id)
-            LOGGER.info(f"Forced rescan for channel {channel_id}. Cache cleared.")
+            LOGGER.info("Forced rescan for channel %s. Cache cleared.", channel_id)
 
         status_message = await send_reply(message, f"<b>🎯 Ultra-precision scan initiated for channel `{channel_id}`...</b>")
 
@@ -104,7 +111,7 @@ async def findencoders_handler(client, message):
 
 
     except Exception as e:
-        LOGGER.error(f"Error in findencoders_handler: {e}", exc_info=True)
+        LOGGER.error("Error in findencoders_handler: %s", e, exc_info=True)
         await send_reply(message, f"<b>An error occurred:</b> <code>{e}</code>")
 
 
@@ -143,31 +150,26 @@ def extract_potential_encoder_tags(text):
     Extracts potential encoder tags by strictly focusing on the last two words of a filename.
     """
     filename_without_ext = os.path.splitext(text)[0]
-    parts = re.split(r'[ ._\[\]()\-]+', filename_without_ext)
+    parts = _TAG_SPLIT_RE.split(filename_without_ext)
     
     # --- NEW LOGIC: Only consider the last two non-empty parts ---
     potential_parts = [p for p in parts if p][-2:]
     
     potential_tags = []
-    
-    known_encoders_set = {enc.upper() for enc in KNOWN_ENCODERS}
-    ignored_tags_set = {tag.upper() for tag in IGNORED_TAGS}
 
     for part in potential_parts:
-        cleaned_part = re.sub(r'[._\[\]()\-]+$', '', part)
+        cleaned_part = _TRAILING_SEP_RE.sub('', part)
         if not cleaned_part:
             continue
             
         part_upper = cleaned_part.upper()
         
         if (
-            part_upper not in known_encoders_set and
-            part_upper not in ignored_tags_set and
+            part_upper not in _KNOWN_ENCODERS_UPPER and
+            part_upper not in _IGNORED_TAGS_UPPER and
             not part_upper.isdigit() and
             len(cleaned_part) > 2 and
-            not re.match(r'S\d{1,2}(E\d{1,3})?$', part_upper) and
-            not re.match(r'\d{3,4}P$', part_upper) and
-            not re.match(r'\d{4}$', part_upper) and # Year
+            not _NON_ENCODER_RE.fullmatch(part_upper) and
             not any(audio_codec in part_upper for audio_codec in ['5.1', '7.1', 'DDP', 'EAC3'])
         ):
             potential_tags.append(cleaned_part)
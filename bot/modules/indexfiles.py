@@ -46,7 +46,7 @@ async def indexfiles_handler(client, message):
         ACTIVE_TASKS[scan_id] = task
             
     except Exception as e:
-        LOGGER.error(f"IndexFiles handler error: {e}")
+        LOGGER.error("IndexFiles handler error: %s", e)
         await send_message(message, f"**Error:** {e}")
 
 async def create_channel_index(channel_id, message, scan_id, force=False):
@@ -64,7 +64,7 @@ async def create_channel_index(channel_id, message, scan_id, force=False):
             return
 
         if force:
-            LOGGER.warning(f"Force rescan triggered for channel {channel_id}. Clearing old media data.")
+            LOGGER.warning("Force rescan triggered for channel %s. Clearing old media data.", channel_id)
             await MongoDB.clear_media_data_for_channel(channel_id)
 
         total_messages = await TgClient.user.get_chat_history_count(chat_id=channel_id)
@@ -84,7 +84,7 @@ async def create_channel_index(channel_id, message, scan_id, force=False):
             for msg in message_batch:
                 media = msg.video or msg.document
                 if media and hasattr(media, 'file_name') and media.file_name:
-                    parsed_temp = parse_media_info(media.file_name)
+                    parsed_temp = await parse_media_info(media.file_name)
                     if parsed_temp and parsed_temp.get('is_split'):
                         base_name = parsed_temp['base_name']
                         if base_name not in base_name_map:
@@ -106,7 +106,7 @@ async def create_channel_index(channel_id, message, scan_id, force=False):
                 first_msg = msg_group[0]
                 media = first_msg.video or first_msg.document
                 if media and hasattr(media, 'file_name') and media.file_name:
-                    parsed = parse_media_info(media.file_name, first_msg.caption)
+                    parsed = await parse_media_info(media.file_name, first_msg.caption)
                     
                     if parsed and 'type' in parsed and 'canonical_title' in parsed:
                         total_size = sum(part.document.file_size for part in msg_group if part.document)
@@ -116,20 +116,20 @@ async def create_channel_index(channel_id, message, scan_id, force=False):
                         media_map[collection_key].append(parsed)
                     else:
                         unparsable_count += 1
-                        LOGGER.warning(f"Could not parse type for filename: {media.file_name}")
+                        LOGGER.warning("Could not parse type for filename: %s", media.file_name)
 
                 processed_messages_count += len(msg_group)
 
-            LOGGER.info(f"Processing batch of {len(media_map)} titles...")
+            LOGGER.info("Processing batch of %s titles...", len(media_map))
             await process_batch(media_map, channel_id)
             message_groups.clear()
 
             await MongoDB.update_scan_progress(scan_id, processed_messages_count)
             
-            LOGGER.info(f"Batch complete. Waiting for 10 seconds before next batch...")
+            LOGGER.info("Batch complete. Waiting for 10 seconds before next batch...")
             await asyncio.sleep(10)
 
-        LOGGER.info(f"Full indexing scan complete for channel {chat.title}.")
+        LOGGER.info("Full indexing scan complete for channel %s.", chat.title)
         
         summary_text = (f"**Indexing Task Finished for {chat.title}**\n\n"
                         f"- Indexed Media: {processed_messages_count - skipped_count - unparsable_count} items\n"
@@ -138,10 +138,10 @@ async def create_channel_index(channel_id, message, scan_id, force=False):
         await send_reply(message, summary_text)
 
     except asyncio.CancelledError:
-        LOGGER.warning(f"Indexing task {scan_id} was cancelled by user.")
+        LOGGER.warning("Indexing task %s was cancelled by user.", scan_id)
         await send_reply(message, f"Indexing for **{chat.title if chat else 'Unknown'}** was cancelled.")
     except Exception as e:
-        LOGGER.error(f"Error during indexing for {channel_id}: {e}", exc_info=True)
+        LOGGER.error("Error during indexing for %s: %s", channel_id, e, exc_info=True)
         await send_reply(message, f"An error occurred during the index scan for channel {channel_id}.")
     finally:
         await MongoDB.end_scan(scan_id)
@@ -175,9 +175,10 @@ async def update_or_create_season_posts(canonical_title, display_title, channel_
         if not media_data or 'seasons' not in media_data:
             return
 
-        for season_num_str in sorted(media_data['seasons'].keys(), key=int):
+        seasons = media_data['seasons']
+        for season_num_str in sorted(seasons.keys(), key=int):
             season_num = int(season_num_str)
-            season_data = media_data['seasons'][season_num_str]
+            season_data = seasons[season_num_str]
 
             # Get or create a specific post tracker for this season
             post_doc = await MongoDB.get_or_create_season_post(canonical_title, display_title, channel_id, season_num)
@@ -192,7 +193,7 @@ async def update_or_create_season_posts(canonical_title, display_title, channel_
             if message_id:
                 try:
                     await TgClient.user.edit_message_text(Config.INDEX_CHANNEL_ID, message_id, post_text)
-                    LOGGER.info(f"Updated post for '{display_title}' Season {season_num}.")
+                    LOGGER.info("Updated post for '%s' Season %s.", display_title, season_num)
                     continue
                 except Exception:
                     pass
@@ -200,11 +201,11 @@ async def update_or_create_season_posts(canonical_title, display_title, channel_
             new_post = await TgClient.user.send_message(Config.INDEX_CHANNEL_ID, post_text)
             if new_post:
                 await MongoDB.update_post_message_id(post_doc['_id'], new_post.id)
-                LOGGER.info(f"Created new post for '{display_title}' Season {season_num}.")
+                LOGGER.info("Created new post for '%s' Season %s.", display_title, season_num)
             await asyncio.sleep(5)
 
     except Exception as e:
-        LOGGER.error(f"Failed to update season posts for '{display_title}': {e}", exc_info=True)
+        LOGGER.error("Failed to update season posts for '%s': %s", display_title, e, exc_info=True)
 
 
 async def update_or_create_movie_post(canonical_title, display_title, channel_id):
@@ -227,7 +228,7 @@ async def update_or_create_movie_post(canonical_title, display_title, channel_id
         if message_id:
             try:
                 await TgClient.user.edit_message_text(Config.INDEX_CHANNEL_ID, message_id, post_text)
-                LOGGER.info(f"Updated post for movie '{display_title}'.")
+                LOGGER.info("Updated post for movie '%s'.", display_title)
                 return
             except Exception:
                 pass
@@ -235,10 +236,10 @@ async def update_or_create_movie_post(canonical_title, display_title, channel_id
         new_post = await TgClient.user.send_message(Config.INDEX_CHANNEL_ID, post_text)
         if new_post:
             await MongoDB.update_post_message_id(post_doc['_id'], new_post.id)
-            LOGGER.info(f"Created new post for movie '{display_title}'.")
+            LOGGER.info("Created new post for movie '%s'.", display_title)
 
     except Exception as e:
-        LOGGER.error(f"Failed to update movie post for '{display_title}': {e}", exc_info=True)
+        LOGGER.error("Failed to update movie post for '%s': %s", display_title, e, exc_info=True)
 
 
 async def get_target_channels(message):
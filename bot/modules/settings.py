@@ -37,21 +37,20 @@ async def settings_handler(client, message):
         await send_message(message, settings_text, keyboard)
         
     except Exception as e:
-        LOGGER.error(f"Settings handler error: {e}")
+        LOGGER.error("Settings handler error: %s", e)
         await send_message(message, f"❌ Error loading settings: {e}")
 
-async def timeout_task(user_id, message, state_to_check):
+async def timeout_task(state_key, message, state_to_check):
     """A background task to handle settings timeout."""
     await asyncio.sleep(60)
     # If the user's state is still the same after 60 seconds, time them out.
-    if USER_STATES.get(user_id) == state_to_check:
-        if user_id in USER_STATES:
-            del USER_STATES[user_id]
+    if USER_STATES.get(state_key) == state_to_check:
+        USER_STATES.pop(state_key)
         await edit_message(message, "**Settings update timed out.**\nPlease use /settings to try again.")
 
 async def set_setting_callback(client, callback_query):
     """Handles all 'Set' button presses from the settings menu."""
-    user_id = callback_query.from_user.id
+    state_key = (callback_query.from_user.id, callback_query.message.chat.id)
     setting_key = callback_query.data.split("set_")[1] # e.g., "index_channel"
     
     if setting_key in SETTINGS:
@@ -59,30 +58,25 @@ async def set_setting_callback(client, callback_query):
         state_to_set = f"awaiting_{setting_key}"
         
         # Set the user's state
-        USER_STATES[user_id] = state_to_set
+        USER_STATES.set(state_key, state_to_set)
         
         # Start the 60-second timeout task
-        asyncio.create_task(timeout_task(user_id, callback_query.message, state_to_set))
+        asyncio.create_task(timeout_task(state_key, callback_query.message, state_to_set))
         
         await callback_query.answer(state_info["prompt"], show_alert=True)
         await edit_message(callback_query.message, f"Okay, I'm ready for the new value. (You have 60 seconds to reply)\n\n{state_info['prompt']}")
 
 async def receive_setting_handler(client, message):
     """Handles the message containing the new value for any setting."""
-    user_id = message.from_user.id
     new_value_text = message.text.strip()
     
-    # Determine which setting we are waiting for
-    state = USER_STATES.get(user_id, "")
-    setting_key = state.replace("awaiting_", "")
-    
-    # The timeout task will handle cleanup if the state is invalid,
-    # but we should still clear the state immediately upon receiving a valid reply.
-    if user_id in USER_STATES:
-        del USER_STATES[user_id]
-    else:
+    # Determine which setting we are waiting for, clearing the state immediately
+    # upon receiving a reply. The timeout task handles cleanup otherwise.
+    state = USER_STATES.pop((message.from_user.id, message.chat.id))
+    if state is None:
         # If the state was already cleared (e.g., by a timeout), do nothing.
         return
+    setting_key = state.replace("awaiting_", "")
 
     if setting_key not in SETTINGS:
         return
@@ -118,5 +112,5 @@ async def receive_setting_handler(client, message):
     except ValueError as e:
         await send_message(message, f"**Error:** That doesn't look like a valid value. {e}. Please use /settings to try again.")
     except Exception as e:
-        LOGGER.error(f"Error setting new value: {e}")
+        LOGGER.error("Error setting new value: %s", e)
         await send_message(message, "An unexpected error occurred. Please use /settings to try again.")
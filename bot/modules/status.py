@@ -42,5 +42,5 @@ async def status_handler(client, message):
     try:
         await trigger_status_creation(message)
     except Exception as e:
-        LOGGER.error(f"Status handler error: {e}")
+        LOGGER.error("Status handler error: %s", e)
         await send_message(message, f"Error creating status message: {e}")
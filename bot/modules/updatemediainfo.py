@@ -5,7 +5,7 @@ High-performance, concurrent MediaInfo processing module with enhanced error log
 import asyncio
 import logging
 import os
-import json
+import orjson
 import re
 import time
 from aiofiles import open as aiopen
@@ -35,6 +35,8 @@ DOWNLOAD_TIMEOUT = 1800 # 30 minutes
 
 # Regex to detect split files like .mkv.001, .001.mkv, and ...part001.mkv
 SPLIT_FILE_REGEX = re.compile(r'(\.(mkv|mp4|avi|mov)\.00[1-9]|\.00[1-9]\.(mkv|mp4|avi|mov)|\.part00[1-9]\.(mkv|mp4|avi|mov))$', re.IGNORECASE)
+VIDEO_TAG_REGEX = re.compile(r'Video\s*[:\-]', re.IGNORECASE)
+AUDIO_TAG_REGEX = re.compile(r'Audio\s*[:\-]', re.IGNORECASE)
 
 async def updatemediainfo_handler(client, message):
     """Handler that initiates a concurrent scan."""
@@ -57,18 +59,18 @@ async def updatemediainfo_handler(client, message):
         await trigger_status_creation(message)
 
         if is_force_failed_run:
-            LOGGER.info(f"Starting CONCURRENT FAILED ID processing for channel {channel_id}")
+            LOGGER.info("Starting CONCURRENT FAILED ID processing for channel %s", channel_id)
             scan_id = f"force_scan_{channel_id}_{message.id}"
             task = asyncio.create_task(force_process_channel_concurrently(channel_id, message, scan_id))
             ACTIVE_TASKS[scan_id] = task
         else:
-            LOGGER.info(f"Starting CONCURRENT standard scan for channel {channel_id}. Rescan: {is_force_rescan}")
+            LOGGER.info("Starting CONCURRENT standard scan for channel %s. Rescan: %s", channel_id, is_force_rescan)
             scan_id = f"scan_{channel_id}_{message.id}"
             task = asyncio.create_task(process_channel_concurrently(channel_id, message, scan_id, force=is_force_rescan))
             ACTIVE_TASKS[scan_id] = task
 
     except Exception as e:
-        LOGGER.error(f"Handler error in updatemediainfo: {e}")
+        LOGGER.error("Handler error in updatemediainfo: %s", e)
         await send_message(message, f"**Error:** {e}")
 
 
@@ -102,7 +104,7 @@ async def process_channel_concurrently(channel_id, message, scan_id, force=False
 
                 media = msg.video or msg.document
                 if media and hasattr(media, 'file_name') and media.file_name and SPLIT_FILE_REGEX.search(media.file_name):
-                    LOGGER.info(f"Skipping split file: {media.file_name}")
+                    LOGGER.info("Skipping split file: %s", media.file_name)
                     stats["skipped"] += 1
                     return
 
@@ -110,7 +112,7 @@ async def process_channel_concurrently(channel_id, message, scan_id, force=False
                     stats["skipped"] += 1
                     return
 
-                LOGGER.info(f"Processing media message {msg.id} in {chat.title}")
+                LOGGER.info("Processing media message %s in %s", msg.id, chat.title)
                 try:
                     success, _ = await process_message_enhanced(msg)
                     if success:
@@ -133,7 +135,7 @@ async def process_channel_concurrently(channel_id, message, scan_id, force=False
 
             for result in results:
                 if isinstance(result, Exception):
-                    LOGGER.error(f"A task failed with an exception in a batch: {result}", exc_info=True)
+                    LOGGER.error("A task failed with an exception in a batch: %s", result, exc_info=True)
 
             processed_count += len(message_batch)
             await MongoDB.update_scan_progress(scan_id, processed_count)
@@ -146,13 +148,13 @@ async def process_channel_concurrently(channel_id, message, scan_id, force=False
                         f"- Errors: {stats['errors']} files\n"
                         f"- Skipped: {stats['skipped']} messages")
         await send_reply(message, summary_text)
-        LOGGER.info(f"Scan complete for {chat.title}. Summary sent.")
+        LOGGER.info("Scan complete for %s. Summary sent.", chat.title)
 
     except asyncio.CancelledError:
-        LOGGER.warning(f"Scan task {scan_id} was cancelled by user.")
+        LOGGER.warning("Scan task %s was cancelled by user.", scan_id)
         await send_reply(message, f"Scan for **{chat.title if chat else 'Unknown'}** was cancelled.")
     except Exception as e:
-        LOGGER.error(f"Critical error in concurrent processing for {channel_id}: {e}")
+        LOGGER.error("Critical error in concurrent processing for %s: %s", channel_id, e)
         await send_reply(message, f"A critical error occurred during the scan for **{chat.title if chat else 'Unknown'}**.")
     finally:
         await MongoDB.end_scan(scan_id)
@@ -187,7 +189,7 @@ async def force_process_channel_concurrently(channel_id, message, scan_id):
             async with semaphore:
                 await asyncio.sleep(5)
                 await flood_wait_event.wait()
-                LOGGER.info(f"Force-processing media message {msg.id} in channel {channel_id}")
+                LOGGER.info("Force-processing media message %s in channel %s", msg.id, channel_id)
                 success, _ = await process_message_full_download_only(msg)
                 if success:
                     stats["processed"] += 1
@@ -198,7 +200,7 @@ async def force_process_channel_concurrently(channel_id, message, scan_id):
         results = await asyncio.gather(*tasks, return_exceptions=True)
         for result in results:
             if isinstance(result, Exception):
-                LOGGER.error(f"A force-scan task failed with an exception: {result}", exc_info=True)
+                LOGGER.error("A force-scan task failed with an exception: %s", result, exc_info=True)
 
         stop_event.set()
         await updater_task
@@ -209,12 +211,12 @@ async def force_process_channel_concurrently(channel_id, message, scan_id):
                         f"- Updated: {stats['processed']} files\n"
                         f"- Errors: {stats['errors']} files")
         await send_reply(message, summary_text)
-        LOGGER.info(f"Force-processing complete for channel {channel_id}.")
+        LOGGER.info("Force-processing complete for channel %s.", channel_id)
     except asyncio.CancelledError:
-        LOGGER.warning(f"Force scan task {scan_id} was cancelled by user.")
+        LOGGER.warning("Force scan task %s was cancelled by user.", scan_id)
         await send_reply(message, f"Force scan for **{chat.title if chat else 'Unknown'}** was cancelled.")
     except Exception as e:
-        LOGGER.error(f"Critical error in force processing for {channel_id}: {e}")
+        LOGGER.error("Critical error in force processing for %s: %s", channel_id, e)
         await send_reply(message, f"A critical error occurred during the force scan for channel **{chat.title if chat else 'Unknown'}**.")
     finally:
         await MongoDB.end_scan(scan_id)
@@ -238,7 +240,7 @@ async def process_message_full_download_only(message):
             await asyncio.wait_for(TgClient.bot.download_media(message, file_name=temp_file), timeout=DOWNLOAD_TIMEOUT)
         except FloodWait as e:
             # --- DEBUG LOGGING ADDED ---
-            LOGGER.warning(f"BOT session FloodWait of {e.value}s on message {message.id} during full download. Pausing ALL tasks...")
+            LOGGER.warning("BOT session FloodWait of %ss on message %s during full download. Pausing ALL tasks...", e.value, message.id)
             flood_wait_event.clear()
 
             scan_id_list = [key for key, task in ACTIVE_TASKS.items() if task is asyncio.current_task()]
@@ -257,7 +259,7 @@ async def process_message_full_download_only(message):
             LOGGER.info("Resuming ALL tasks after flood wait.")
             flood_wait_event.set()
             
-            LOGGER.warning(f"Task for message {message.id} failed due to FloodWait. It will be marked as an error.")
+            LOGGER.warning("Task for message %s failed due to FloodWait. It will be marked as an error.", message.id)
             return False, "flood_wait_handled"
         
         metadata = await extract_mediainfo_from_file(temp_file)
@@ -266,7 +268,7 @@ async def process_message_full_download_only(message):
             video_info, audio_tracks = parse_essential_metadata(metadata)
         
         if not video_info and not audio_tracks:
-            LOGGER.warning(f"MediaInfo failed for {filename}. Trying ffprobe as a fallback.")
+            LOGGER.warning("MediaInfo failed for %s. Trying ffprobe as a fallback.", filename)
             ffprobe_metadata = await extract_metadata_with_ffprobe(temp_file)
             if ffprobe_metadata:
                 video_info, audio_tracks = parse_ffprobe_metadata(ffprobe_metadata)
@@ -278,10 +280,10 @@ async def process_message_full_download_only(message):
         
         return False, "failed"
     except TimeoutError:
-        LOGGER.error(f"Download timed out for message {message.id} due to network issues.")
+        LOGGER.error("Download timed out for message %s due to network issues.", message.id)
         return False, "timeout"
     except Exception as e:
-        LOGGER.error(f"Full download processing error for message {message.id}: {e}", exc_info=True)
+        LOGGER.error("Full download processing error for message %s: %s", message.id, e, exc_info=True)
         return False, "error"
     finally:
         await cleanup_files([temp_file])
@@ -318,7 +320,7 @@ async def process_message_enhanced(message):
                             return True, f"chunk{CHUNK_STEPS[0]}"
         except FloodWait as e:
             # --- DEBUG LOGGING ADDED ---
-            LOGGER.warning(f"BOT session FloodWait of {e.value}s on message {message.id} during chunk stream. Pausing ALL tasks...")
+            LOGGER.warning("BOT session FloodWait of %ss on message %s during chunk stream. Pausing ALL tasks...", e.value, message.id)
             flood_wait_event.clear()
 
             scan_id_list = [key for key, task in ACTIVE_TASKS.items() if task is asyncio.current_task()]
@@ -337,12 +339,12 @@ async def process_message_enhanced(message):
             LOGGER.info("Resuming ALL tasks after flood wait.")
             flood_wait_event.set()
             
-            LOGGER.warning(f"Task for message {message.id} failed due to FloodWait. It will be marked as an error.")
+            LOGGER.warning("Task for message %s failed due to FloodWait. It will be marked as an error.", message.id)
             return False, "flood_wait_handled"
         except TimeoutError:
-            LOGGER.warning(f"Chunk download timed out for message {message.id}.")
+            LOGGER.warning("Chunk download timed out for message %s.", message.id)
         except Exception as e:
-            LOGGER.warning(f"Chunk-based processing failed for message {message.id}: {e}")
+            LOGGER.warning("Chunk-based processing failed for message %s: %s", message.id, e)
             pass
 
         if file_size <= FULL_DOWNLOAD_LIMIT:
@@ -356,7 +358,7 @@ async def process_message_enhanced(message):
                     video_info, audio_tracks = parse_essential_metadata(metadata)
 
                 if not video_info and not audio_tracks:
-                    LOGGER.warning(f"MediaInfo failed for {filename}. Trying ffprobe as a fallback.")
+                    LOGGER.warning("MediaInfo failed for %s. Trying ffprobe as a fallback.", filename)
                     ffprobe_metadata = await extract_metadata_with_ffprobe(temp_file)
                     if ffprobe_metadata:
                         video_info, audio_tracks = parse_ffprobe_metadata(ffprobe_metadata)
@@ -367,12 +369,12 @@ async def process_message_enhanced(message):
                         return True, "full"
 
             except TimeoutError:
-                LOGGER.warning(f"Full download timed out for message {message.id}")
+                LOGGER.warning("Full download timed out for message %s", message.id)
                 return False, "timeout"
         
         return False, "failed"
     except Exception as e:
-        LOGGER.error(f"Enhanced processing error for message {message.id}: {e}")
+        LOGGER.error("Enhanced processing error for message %s: %s", message.id, e)
         return False, "error"
     finally:
         await cleanup_files([temp_file])
@@ -426,7 +428,7 @@ async def update_caption_clean(message, video_info, audio_tracks):
         return False
     except FloodWait as e:
         # --- DEBUG LOGGING ADDED ---
-        LOGGER.warning(f"USER session FloodWait of {e.value}s on message {message.id} during caption edit. Pausing ALL tasks...")
+        LOGGER.warning("USER session FloodWait of %ss on message %s during caption edit. Pausing ALL tasks...", e.value, message.id)
         flood_wait_event.clear()
         await asyncio.sleep(e.value + 5)
         flood_wait_event.set()
@@ -434,7 +436,7 @@ async def update_caption_clean(message, video_info, audio_tracks):
         # Return False as the edit failed this time
         return False
     except Exception as e:
-        LOGGER.error(f"Caption update error for message {message.id}: {e}")
+        LOGGER.error("Caption update error for message %s: %s", message.id, e)
         return False
 
 # --- The rest of the helper functions remain unchanged ---
@@ -446,9 +448,9 @@ async def extract_mediainfo_from_file(file_path):
             stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
         )
         stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=MEDIAINFO_TIMEOUT)
-        return json.loads(stdout.decode()) if stdout else None
+        return orjson.loads(stdout) if stdout else None
     except Exception as e:
-        LOGGER.error(f"MediaInfo extraction error on file {file_path}: {e}")
+        LOGGER.error("MediaInfo extraction error on file %s: %s", file_path, e)
         return None
 
 async def extract_metadata_with_ffprobe(file_path):
@@ -467,9 +469,9 @@ async def extract_metadata_with_ffprobe(file_path):
             stderr=asyncio.subprocess.PIPE
         )
         stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=FFPROBE_TIMEOUT)
-        return json.loads(stdout.decode()) if stdout else None
+        return orjson.loads(stdout) if stdout else None
     except Exception as e:
-        LOGGER.error(f"FFprobe extraction error on file {file_path}: {e}")
+        LOGGER.error("FFprobe extraction error on file %s: %s", file_path, e)
         return None
 
 def parse_ffprobe_metadata(metadata):
@@ -491,7 +493,7 @@ def parse_ffprobe_metadata(metadata):
         
         return video_info, audio_tracks
     except Exception as e:
-        LOGGER.error(f"FFprobe metadata parsing error: {e}")
+        LOGGER.error("FFprobe metadata parsing error: %s", e)
         return None, []
 
 def parse_essential_metadata(metadata):
@@ -515,7 +517,7 @@ def parse_essential_metadata(metadata):
                     audio_tracks.append({"language": None})
         return video_info, audio_tracks
     except Exception as e:
-        LOGGER.error(f"Metadata parsing error: {e}")
+        LOGGER.error("Metadata parsing error: %s", e)
         return None, []
 
 async def cleanup_files(file_paths):
@@ -524,7 +526,7 @@ async def cleanup_files(file_paths):
             if file_path and os.path.exists(file_path):
                 await aioremove(file_path)
         except Exception as e:
-            LOGGER.warning(f"File cleanup warning for {file_path}: {e}")
+            LOGGER.warning("File cleanup warning for %s: %s", file_path, e)
             pass
 
 async def has_media(msg):
@@ -532,8 +534,8 @@ async def has_media(msg):
 
 async def already_has_mediainfo(msg):
     caption = msg.caption or ""
-    video_tags = re.findall(r'Video\s*[:\-]', caption, re.IGNORECASE)
-    audio_tags = re.findall(r'Audio\s*[:\-]', caption, re.IGNORECASE)
+    video_tags = VIDEO_TAG_REGEX.findall(caption)
+    audio_tags = AUDIO_TAG_REGEX.findall(caption)
     if len(video_tags) > 1 or len(audio_tags) > 1:
         return False
     if len(video_tags) == 1 and len(audio_tags) == 1:
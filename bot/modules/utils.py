@@ -10,6 +10,9 @@ from bot.core.client import TgClient # Import TgClient to send files
 
 LOGGER = logging.getLogger(__name__)
 
+# Buffered log.txt handler installed by bot/__main__.py; flushed before /log uploads the file
+LOG_FILE_HANDLER = None
+
 def format_bytes(byte_count):
     """Helper function to format bytes into KB, MB, GB, etc."""
     if byte_count is None:
@@ -25,6 +28,10 @@ def format_bytes(byte_count):
 async def log_handler(client, message):
     """Handler for the /log command to send the full log file."""
     try:
+        # Write out records still held in memory so the upload includes the latest warnings
+        if LOG_FILE_HANDLER is not None:
+            LOG_FILE_HANDLER.flush()
+
         # Use the bot client to send the log file as a document
         await TgClient.bot.send_document(
             chat_id=message.chat.id,
@@ -35,7 +42,7 @@ async def log_handler(client, message):
     except FileNotFoundError:
         await send_reply(message, "Log file not found. Make sure logging is configured correctly.")
     except Exception as e:
-        LOGGER.error(f"Log handler error: {e}")
+        LOGGER.error("Log handler error: %s", e)
         await send_reply(message, f"Error sending log file: {e}")
 
 async def stats_handler(client, message):
@@ -74,5 +81,5 @@ async def stats_handler(client, message):
         await send_reply(message, stats_text)
 
     except Exception as e:
-        LOGGER.error(f"Stats handler error: {e}")
+        LOGGER.error("Stats handler error: %s", e)
         await send_reply(message, f"Error getting server stats: {e}")